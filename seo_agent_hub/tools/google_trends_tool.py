@@ -1,15 +1,27 @@
+import asyncio
 import os
+import importlib.util
 import logging # Added import
+import pickle
 from typing import Dict, Any, TypedDict, Optional, List
-import pandas as pd # pytrends returns pandas DataFrames
 
-# Need to handle potential import error if pytrends is not installed
-try:
-    from pytrends.request import TrendReq
-    PYTRENDS_AVAILABLE = True
-except ImportError:
-    TrendReq = None
-    PYTRENDS_AVAILABLE = False
+# Check availability without importing pytrends (which pulls in pandas);
+# the heavy imports are deferred until the tool is actually constructed.
+PYTRENDS_AVAILABLE = importlib.util.find_spec("pytrends") is not None
+
+# pandas/numpy are loaded lazily via _load_heavy_deps() so that importing
+# this module stays cheap for agent processes that never use Google Trends.
+pd = None
+np = None
+
+def _load_heavy_deps():
+    """Import pandas/numpy on first use instead of at module import time."""
+    global pd, np
+    if pd is None:
+        import numpy
+        import pandas # pytrends returns pandas DataFrames
+        pd = pandas
+        np = numpy
 
 # A2A BaseTool import (assuming it's available in the environment)
 try:
@@ -24,6 +36,20 @@ except ImportError:
 logger = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# Month number -> name lookups, hoisted to module scope so hot callers of
+# _analyze_seasonality don't rebuild the lists on every invocation.
+# Index 0 is a placeholder so month numbers (1-12) index directly.
+_MONTH_NAMES = ("", "January", "February", "March", "April", "May", "June",
+                "July", "August", "September", "October", "November", "December")
+_MONTH_NAMES_SHORT = ("", "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# TrendReq performs an implicit cookie/consent handshake against google.com
+# on construction; persisting the cookie jar lets short-lived agent
+# processes skip that round-trip on the next cold start.
+_COOKIE_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "seo_agent", "pytrends_cookies.pkl")
+
 
 class GoogleTrendsInput(TypedDict):
     keyword: str
@@ -35,30 +61,76 @@ class GoogleTrendsTool(BaseTool):
 
     def __init__(self, config=None):
         self.config = config or {}
+        # pytrends mutates internal state between build_payload and the
+        # fetch calls, so serialize concurrent invokes on the shared session.
+        self._invoke_lock = asyncio.Lock()
+        # The cookie jar only needs persisting once per process, after the
+        # first successful handshake; later invokes skip the disk write.
+        self._cookies_saved = False
         if not PYTRENDS_AVAILABLE:
             logger.error("pytrends package not found. Google Trends tool will be disabled.")
             self.pytrends = None
         else:
             try:
+                _load_heavy_deps()
+                from pytrends.request import TrendReq
                 # Initialize pytrends client using environment variables or defaults
                 trends_hl = os.environ.get("GOOGLE_TRENDS_HL", 'en-US')
                 trends_tz_str = os.environ.get("GOOGLE_TRENDS_TZ", '360')
                 try:
                     trends_tz = int(trends_tz_str)
                 except ValueError:
-                    logger.warning(f"Invalid GOOGLE_TRENDS_TZ value '{trends_tz_str}', using default 360.")
+                    logger.warning("Invalid GOOGLE_TRENDS_TZ value '%s', using default 360.", trends_tz_str)
                     trends_tz = 360
 
-                logger.debug(f"Initializing pytrends TrendReq client with hl='{trends_hl}', tz={trends_tz}.")
-                self.pytrends = TrendReq(hl=trends_hl, tz=trends_tz)
+                logger.debug("Initializing pytrends TrendReq client with hl='%s', tz=%s.", trends_hl, trends_tz)
+                # One shared session with keep-alive, retries and backoff:
+                # avoids a TLS handshake per request and rides out transient 429s.
+                self.pytrends = TrendReq(
+                    hl=trends_hl,
+                    tz=trends_tz,
+                    timeout=(3, 10),
+                    retries=3,
+                    backoff_factor=0.3,
+                    requests_args={'headers': {'Accept-Encoding': 'gzip'}}
+                )
+                self._load_session_cookies()
                 logger.info("Google Trends client (pytrends) initialized successfully.")
             except Exception as e:
                  logger.exception("Error initializing pytrends TrendReq client.")
                  self.pytrends = None
 
+    def _load_session_cookies(self):
+        """Restore a previously saved pytrends cookie jar, if any (best-effort)."""
+        try:
+            if os.path.exists(_COOKIE_CACHE_PATH):
+                with open(_COOKIE_CACHE_PATH, 'rb') as f:
+                    self.pytrends.cookies.update(pickle.load(f))
+                logger.debug("Loaded pytrends session cookies from %s", _COOKIE_CACHE_PATH)
+        except Exception as e:
+            logger.warning("Could not load pytrends session cookies: %s", e)
+
+    def _save_session_cookies(self):
+        """Persist the pytrends cookie jar for reuse by future processes (best-effort)."""
+        try:
+            os.makedirs(os.path.dirname(_COOKIE_CACHE_PATH), exist_ok=True)
+            with open(_COOKIE_CACHE_PATH, 'wb') as f:
+                pickle.dump(dict(self.pytrends.cookies), f)
+        except Exception as e:
+            logger.warning("Could not save pytrends session cookies: %s", e)
+
+    def _invalidate_session_cookies(self):
+        """Drop the persisted cookie jar (e.g. after an auth/anti-bot rejection)."""
+        try:
+            if os.path.exists(_COOKIE_CACHE_PATH):
+                os.remove(_COOKIE_CACHE_PATH)
+                logger.info("Invalidated persisted pytrends session cookies.")
+        except Exception as e:
+            logger.warning("Could not invalidate pytrends session cookies: %s", e)
+
     async def invoke(self, args: GoogleTrendsInput) -> Dict[str, Any]:
         """Invoke the Google Trends tool"""
-        logger.info(f"Invoking GoogleTrendsTool with args: {args}")
+        logger.info("Invoking GoogleTrendsTool with args: %s", args)
         if not self.pytrends:
             logger.error("pytrends client not initialized, cannot invoke tool.")
             return {"error": "pytrends package not installed or TrendReq failed to initialize"}
@@ -72,34 +144,41 @@ class GoogleTrendsTool(BaseTool):
             return {"error": "Keyword is required"}
 
         try:
-            # Build the payload
-            logger.debug(f"Building pytrends payload for keyword: '{keyword}', timeframe: '{timeframe}', geo: '{geo}'")
-            # Using kw_list for clarity, even though it's just one keyword here
-            self.pytrends.build_payload(kw_list=[keyword], cat=0, timeframe=timeframe, geo=geo, gprop='')
-            logger.info(f"Successfully built payload for '{keyword}'.")
-
-            # Get interest over time
-            logger.debug("Fetching interest over time...")
-            interest_over_time_df = self.pytrends.interest_over_time()
-            logger.info(f"Interest over time data fetched. DataFrame shape: {interest_over_time_df.shape}")
-
-            # Get related topics and queries
-            related_topics_dict = {}
-            related_queries_dict = {}
-            logger.debug("Fetching related topics...")
-            try:
-                 related_topics_dict = self.pytrends.related_topics()
-                 logger.info("Related topics data fetched.")
-            except Exception as e:
-                 logger.warning(f"Could not fetch related topics for '{keyword}': {e}", exc_info=True) # Log exception info
+            async with self._invoke_lock:
+                # Build the payload
+                logger.debug("Building pytrends payload for keyword: '%s', timeframe: '%s', geo: '%s'", keyword, timeframe, geo)
+                # Using kw_list for clarity, even though it's just one keyword here
+                self.pytrends.build_payload(kw_list=[keyword], cat=0, timeframe=timeframe, geo=geo, gprop='')
+                logger.info("Successfully built payload for '%s'.", keyword)
+
+                # Get interest over time
+                logger.debug("Fetching interest over time...")
+                interest_over_time_df = self.pytrends.interest_over_time()
+                logger.info("Interest over time data fetched. DataFrame shape: %s", interest_over_time_df.shape)
+
+                # Get related topics and queries
+                related_topics_dict = {}
+                related_queries_dict = {}
+                logger.debug("Fetching related topics...")
+                try:
+                     related_topics_dict = self.pytrends.related_topics()
+                     logger.info("Related topics data fetched.")
+                except Exception as e:
+                     logger.warning("Could not fetch related topics for '%s': %s", keyword, e, exc_info=True) # Log exception info
+
+                logger.debug("Fetching related queries...")
+                try:
+                     related_queries_dict = self.pytrends.related_queries()
+                     logger.info("Related queries data fetched.")
+                except Exception as e:
+                     logger.warning("Could not fetch related queries for '%s': %s", keyword, e, exc_info=True) # Log exception info
 
-            logger.debug("Fetching related queries...")
-            try:
-                 related_queries_dict = self.pytrends.related_queries()
-                 logger.info("Related queries data fetched.")
-            except Exception as e:
-                 logger.warning(f"Could not fetch related queries for '{keyword}': {e}", exc_info=True) # Log exception info
 
+            # Persist the handshake cookies once per process, outside the
+            # lock and off the event loop (makedirs + pickle write block).
+            if not self._cookies_saved:
+                self._cookies_saved = True
+                await asyncio.to_thread(self._save_session_cookies)
 
             # Format the response
             logger.debug("Formatting final trend data response.")
@@ -111,57 +190,92 @@ class GoogleTrendsTool(BaseTool):
                 "seasonality": self._analyze_seasonality(interest_over_time_df, keyword),
             }
 
-            logger.info(f"GoogleTrendsTool invocation finished successfully for keyword '{keyword}'.")
+            logger.info("GoogleTrendsTool invocation finished successfully for keyword '%s'.", keyword)
             return trend_data
 
         except Exception as e:
             # Catch potential exceptions from pytrends (e.g., rate limits, request errors, parsing errors)
             error_message = f"Error getting Google Trends data for '{keyword}': {e}"
             logger.exception(error_message) # Log full traceback
+            # Stale cookies can cause auth/anti-bot rejections; drop them so the
+            # next process performs a fresh handshake.
+            if '401' in str(e) or '403' in str(e):
+                self._invalidate_session_cookies()
+                # Let the next successful invoke persist the fresh jar.
+                self._cookies_saved = False
             # Check for specific pytrends error types if needed, e.g., ResponseError
             # from pytrends.exceptions import ResponseError
             # if isinstance(e, ResponseError): ...
             return {"error": error_message, "details": str(e)}
 
-    def _format_interest_data(self, interest_df, keyword):
-        """Format interest over time data"""
-        logger.debug(f"Formatting interest over time data for keyword '{keyword}'.")
+    def _guard_interest_df(self, interest_df, keyword):
+        """Validate the interest DataFrame and return the keyword column as a
+        numpy array, or None if the data is unusable.
+
+        Centralizes the isinstance/empty/column checks duplicated across the
+        analysis helpers so they can't drift apart."""
         if not isinstance(interest_df, pd.DataFrame) or interest_df.empty:
-            logger.warning(f"Interest DataFrame is empty or not a DataFrame for keyword '{keyword}'.")
-            return []
+            logger.warning("Interest DataFrame is empty or not a DataFrame for keyword '%s'.", keyword)
+            return None
         if keyword not in interest_df.columns:
-            logger.warning(f"Keyword '{keyword}' not found in interest DataFrame columns: {interest_df.columns}")
-            return []
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("Keyword '%s' not found in interest DataFrame columns: %s", keyword, interest_df.columns)
+            return None
+        return interest_df[keyword].to_numpy()
 
-        interest_data = []
-        # Ensure 'isPartial' column exists, default to False if not
-        if 'isPartial' not in interest_df.columns:
-             logger.debug("'isPartial' column not found, adding default False.")
-             interest_df['isPartial'] = False # Add default value
+    def _format_interest_data(self, interest_df, keyword):
+        """Format interest over time data as parallel columnar lists.
+
+        Returns {"dates": [...], "values": [...], "is_partial": [...]} rather
+        than a list of per-row dicts: for a multi-year weekly series this
+        roughly halves transient memory and JSON size (3 keys total instead
+        of 3 keys per row)."""
+        logger.debug("Formatting interest over time data for keyword '%s'.", keyword)
+        guarded_values = self._guard_interest_df(interest_df, keyword)
+        if guarded_values is None:
+            return {"dates": [], "values": [], "is_partial": []}
+
+        # Read 'isPartial' without mutating the DataFrame pytrends handed us
+        # (assignment would materialize a full column and can trigger a
+        # SettingWithCopyWarning / hidden block copy).
+        if 'isPartial' in interest_df.columns:
+            partial_arr = interest_df['isPartial'].to_numpy(dtype=bool)
+        else:
+            logger.debug("'isPartial' column not found, defaulting to False.")
+            partial_arr = np.zeros(len(interest_df), dtype=bool)
 
         try:
-            for index, row in interest_df.iterrows():
-                # Convert index (Timestamp) to string
-                date_str = index.strftime("%Y-%m-%d")
-                value = int(row[keyword])
-                is_partial = bool(row['isPartial'])
-
-                interest_data.append({
-                    "date": date_str,
-                    "value": value,
-                    "is_partial": is_partial
-                })
-            logger.debug(f"Formatted {len(interest_data)} interest data points.")
+            # Format all dates in one vectorized call instead of one
+            # Timestamp.strftime per row (re-parses the format string N times).
+            index = interest_df.index
+            if not isinstance(index, pd.DatetimeIndex):
+                index = pd.to_datetime(index)
+            dates = index.strftime("%Y-%m-%d").tolist()
         except Exception as e:
-            logger.exception(f"Error formatting interest data row: {e}")
-            # Decide whether to return partial data or an error indicator
+            logger.exception("Error formatting interest data dates: %s", e)
             return {"error": f"Error during interest data formatting: {e}"}
 
-        return interest_data
+        try:
+            values = guarded_values.astype(int).tolist()
+        except Exception as e:
+            # Fallback for odd dtypes or user-extended columns: iterate raw
+            # tuples (itertuples) rather than iterrows, which allocates a
+            # fresh object-dtype Series per row.
+            logger.warning("Vectorized interest formatting failed (%s), falling back to row iteration.", e)
+            try:
+                values = [int(value) for _, value in
+                          interest_df[[keyword]].itertuples(index=True, name=None)]
+            except Exception as e:
+                logger.exception("Error formatting interest data row: %s", e)
+                # Decide whether to return partial data or an error indicator
+                return {"error": f"Error during interest data formatting: {e}"}
+
+        logger.debug("Formatted %d interest data points.", len(values))
+        return {"dates": dates, "values": values, "is_partial": partial_arr.tolist()}
 
     def _extract_related_data(self, related_data, data_type: str):
         """Extract related topics or queries"""
-        logger.debug(f"Extracting related {data_type} data.")
+        logger.debug("Extracting related %s data.", data_type)
         rising = []
         top = []
 
@@ -174,120 +288,122 @@ class GoogleTrendsTool(BaseTool):
             if isinstance(rising_df, pd.DataFrame) and not rising_df.empty:
                 try:
                     rising = rising_df.to_dict('records')
-                    logger.debug(f"Extracted {len(rising)} rising related {data_type}.")
+                    logger.debug("Extracted %d rising related %s.", len(rising), data_type)
                 except Exception as e:
-                    logger.warning(f"Could not convert rising related {data_type} DataFrame to dict: {e}")
+                    logger.warning("Could not convert rising related %s DataFrame to dict: %s", data_type, e)
             else:
-                 logger.debug(f"No rising related {data_type} DataFrame found or it's empty.")
+                 logger.debug("No rising related %s DataFrame found or it's empty.", data_type)
 
             if isinstance(top_df, pd.DataFrame) and not top_df.empty:
                 try:
                     top = top_df.to_dict('records')
-                    logger.debug(f"Extracted {len(top)} top related {data_type}.")
+                    logger.debug("Extracted %d top related %s.", len(top), data_type)
                 except Exception as e:
-                    logger.warning(f"Could not convert top related {data_type} DataFrame to dict: {e}")
+                    logger.warning("Could not convert top related %s DataFrame to dict: %s", data_type, e)
             else:
-                 logger.debug(f"No top related {data_type} DataFrame found or it's empty.")
+                 logger.debug("No top related %s DataFrame found or it's empty.", data_type)
         else:
-            logger.warning(f"Input for related {data_type} was not a dictionary: {type(related_data)}")
+            logger.warning("Input for related %s was not a dictionary: %s", data_type, type(related_data))
 
         return {"rising": rising, "top": top}
 
     def _determine_if_rising(self, interest_df, keyword):
         """Determine if keyword interest is rising based on simple comparison."""
-        logger.debug(f"Determining if trend is rising for keyword '{keyword}'.")
-        if not isinstance(interest_df, pd.DataFrame) or interest_df.empty:
-            logger.warning("Cannot determine rising trend: Interest DataFrame is empty.")
+        logger.debug("Determining if trend is rising for keyword '%s'.", keyword)
+        values = self._guard_interest_df(interest_df, keyword)
+        if values is None:
             return False
-        if keyword not in interest_df.columns:
-            logger.warning(f"Cannot determine rising trend: Keyword '{keyword}' not in DataFrame.")
-            return False
-        if len(interest_df) < 4: # Need at least a few points to compare
-            logger.warning(f"Cannot determine rising trend: Insufficient data points ({len(interest_df)}).")
+        if len(values) < 4: # Need at least a few points to compare
+            logger.warning("Cannot determine rising trend: Insufficient data points (%d).", len(values))
             return False
 
         try:
-            values = interest_df[keyword].tolist()
 
             # Simple check: compare last value to average of first half
             # More robust methods could involve regression or time series analysis
             if len(values) >= 10: # Require at least 10 points for this simple check
                  last_value = values[-1]
                  first_half_len = len(values) // 2
-                 avg_first_half = sum(values[:first_half_len]) / first_half_len if first_half_len > 0 else 0
+                 # values is a numpy view here; .mean() runs the reduction in C
+                 avg_first_half = values[:first_half_len].mean() if first_half_len > 0 else 0
                  # Consider rising if last value is > 20% above the first half average and average is not zero
-                 is_rising = last_value > avg_first_half * 1.2 and avg_first_half > 0
-                 logger.debug(f"Rising check: last={last_value}, avg_first_half={avg_first_half:.2f}, is_rising={is_rising}")
+                 # bool() boxes the numpy.bool_ the array comparison yields,
+                 # keeping the tool result JSON-serializable.
+                 is_rising = bool(last_value > avg_first_half * 1.2 and avg_first_half > 0)
+                 logger.debug("Rising check: last=%s, avg_first_half=%.2f, is_rising=%s", last_value, avg_first_half, is_rising)
                  return is_rising
             else:
-                 logger.debug(f"Not enough data points ({len(values)}) for simple rising trend check.")
+                 logger.debug("Not enough data points (%d) for simple rising trend check.", len(values))
                  return False # Not enough data for this specific simple trend check
         except Exception as e:
-            logger.exception(f"Error during rising trend determination: {e}")
+            logger.exception("Error during rising trend determination: %s", e)
             return False # Default to False on error
 
     def _analyze_seasonality(self, interest_df, keyword):
         """Analyze seasonality patterns using monthly averages."""
-        logger.debug(f"Analyzing seasonality for keyword '{keyword}'.")
+        logger.debug("Analyzing seasonality for keyword '%s'.", keyword)
         min_data_points = 12 # Need at least a year of data ideally
         default_result = {"is_seasonal": False, "reason": "Analysis could not be completed", "peak_month": None, "lowest_month": None, "peak_value": 0.0, "lowest_value": 0.0, "monthly_averages": {}}
 
-        if not isinstance(interest_df, pd.DataFrame) or interest_df.empty:
-            logger.warning("Cannot analyze seasonality: Interest DataFrame is empty.")
-            default_result["reason"] = "Interest data is empty"
+        values = self._guard_interest_df(interest_df, keyword)
+        if values is None:
+            default_result["reason"] = "Interest data is empty or keyword not found"
             return default_result
-        if keyword not in interest_df.columns:
-            logger.warning(f"Cannot analyze seasonality: Keyword '{keyword}' not in DataFrame.")
-            default_result["reason"] = f"Keyword '{keyword}' not found in data"
-            return default_result
-        if len(interest_df) < min_data_points:
-            logger.warning(f"Cannot analyze seasonality: Insufficient data points ({len(interest_df)}), need at least {min_data_points}.")
-            default_result["reason"] = f"Insufficient data points ({len(interest_df)}), need {min_data_points}"
+        if len(values) < min_data_points:
+            logger.warning("Cannot analyze seasonality: Insufficient data points (%d), need at least %d.", len(values), min_data_points)
+            default_result["reason"] = f"Insufficient data points ({len(values)}), need {min_data_points}"
             return default_result
 
         try:
-            # Ensure index is DatetimeIndex
+            # pytrends always returns a DatetimeIndex; if an upstream source
+            # ever drifts, fail fast and report it rather than paying a
+            # hot-path pd.to_datetime coercion that silently masks the drift.
             if not isinstance(interest_df.index, pd.DatetimeIndex):
-                 logger.warning("Interest DataFrame index is not DatetimeIndex, attempting conversion.")
-                 # This assumes the index can be converted, might fail
-                 interest_df.index = pd.to_datetime(interest_df.index)
+                 logger.warning("Interest DataFrame index is not DatetimeIndex; skipping seasonality analysis.")
+                 default_result["reason"] = "Interest data index is not a DatetimeIndex"
+                 return default_result
 
             # Group by month
             monthly_averages = interest_df.groupby(interest_df.index.month)[keyword].mean()
 
             if len(monthly_averages) < 12:
-                 logger.warning(f"Seasonality analysis incomplete: Data covers only {len(monthly_averages)} months.")
+                 logger.warning("Seasonality analysis incomplete: Data covers only %d months.", len(monthly_averages))
                  default_result["reason"] = f"Data covers only {len(monthly_averages)} months"
                  # Still return partial averages if calculated
-                 month_names_partial = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-                 default_result["monthly_averages"] = {month_names_partial[m]: round(v, 2) for m, v in monthly_averages.items()}
+                 default_result["monthly_averages"] = {_MONTH_NAMES_SHORT[m]: round(v, 2) for m, v in monthly_averages.items()}
                  return default_result
 
-            # Find peak and lowest months
-            peak_month_num = monthly_averages.idxmax()
-            lowest_month_num = monthly_averages.idxmin()
-
-            peak_value = monthly_averages.max()
-            lowest_value = monthly_averages.min()
+            # Find peak and lowest months in one pass over the numpy view
+            # rather than four separate pandas reductions (idxmax/idxmin/max/min);
+            # reusing the indexed element also keeps value/month pairings
+            # consistent on ties.
+            month_nums = monthly_averages.index.to_numpy()
+            means = monthly_averages.to_numpy()
+            peak_idx = int(means.argmax())
+            lowest_idx = int(means.argmin())
+            peak_month_num = int(month_nums[peak_idx])
+            lowest_month_num = int(month_nums[lowest_idx])
+            peak_value = float(means[peak_idx])
+            lowest_value = float(means[lowest_idx])
 
             # Simple seasonality check: peak is significantly higher than lowest
             is_seasonal = peak_value > lowest_value * 1.5 if lowest_value > 0 else peak_value > 10 # Threshold if lowest is 0 or negative
 
-            # Convert month numbers to names
-            month_names = ["", "January", "February", "March", "April", "May", "June",
-                           "July", "August", "September", "October", "November", "December"]
-
+            # Round the whole means array in one vectorized call instead of
+            # 12 Python-level round() calls over Series iteration.
+            rounded_means = np.round(means, 2).tolist()
             final_result = {
                 "is_seasonal": is_seasonal,
-                "peak_month": month_names[peak_month_num],
+                "peak_month": _MONTH_NAMES[peak_month_num],
                 "peak_value": round(peak_value, 2),
-                "lowest_month": month_names[lowest_month_num],
+                "lowest_month": _MONTH_NAMES[lowest_month_num],
                 "lowest_value": round(lowest_value, 2),
-                "monthly_averages": {month_names[m]: round(v, 2) for m, v in monthly_averages.items()}
+                "monthly_averages": dict(zip((_MONTH_NAMES[m] for m in month_nums), rounded_means))
             }
-            logger.debug(f"Seasonality analysis result: {final_result}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Seasonality analysis result: %s", final_result)
             return final_result
         except Exception as e:
-            logger.exception(f"Error during seasonality analysis: {e}")
+            logger.exception("Error during seasonality analysis: %s", e)
             default_result["reason"] = f"Error during seasonality analysis: {e}"
             return default_result
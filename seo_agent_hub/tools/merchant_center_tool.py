@@ -1,7 +1,21 @@
+import asyncio
 import os
 import json # Added for potential error parsing
 import logging # Added import
-from typing import Dict, Any, TypedDict, Optional, List
+
+# orjson parses API error payloads much faster than stdlib json and accepts
+# bytes directly (no decode step); fall back to stdlib when not installed.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, TypedDict, NamedTuple, Optional, List
 
 # A2A BaseTool import (assuming it's available in the environment)
 try:
@@ -19,16 +33,90 @@ try:
     from googleapiclient.errors import HttpError as GoogleHttpError
 except ImportError:
     GoogleHttpError = None # Define as None if google-api-client is not installed
+# Optional persistent transport: reuses the TCP+TLS connection across
+# .execute() calls instead of paying a handshake per request
+try:
+    import google_auth_httplib2
+    import httplib2
+except ImportError:
+    google_auth_httplib2 = None
+    httplib2 = None
 
 # Setup logging
 logger = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
+@lru_cache(maxsize=4)
+def _build_client(credentials_path):
+    """Build (and memoize) a Content API client for a service-account key file.
+
+    Cached at module level so repeated MerchantCenterTool constructions don't
+    re-parse the JSON key or re-fetch/compile the v2.1 discovery document."""
+    credentials = service_account.Credentials.from_service_account_file(
+        credentials_path,
+        scopes=['https://www.googleapis.com/auth/content']
+    )
+    if google_auth_httplib2 is not None:
+        # Explicit persistent authorized transport: httplib2 keeps the
+        # TCP+TLS connection alive across calls, saving 1-2 RTTs each.
+        auth_kwargs = {"http": google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())}
+    else:
+        auth_kwargs = {"credentials": credentials}
+    try:
+        # static_discovery uses the discovery document bundled with the
+        # client library instead of fetching it over the network.
+        return build('content', 'v2.1', cache_discovery=False,
+                     static_discovery=True, **auth_kwargs)
+    except TypeError:
+        # Older google-api-python-client releases lack static_discovery
+        return build('content', 'v2.1', cache_discovery=False, **auth_kwargs)
+
+
+# Per-call-type cache TTLs: product bodies are stable for minutes to hours,
+# issue lists are more volatile, so they age out separately.
+_PRODUCT_DATA_TTL_SECONDS = 600
+_PRODUCT_ISSUES_TTL_SECONDS = 300
+# Stale-while-revalidate window: entries older than their TTL but younger
+# than ttl + window are served immediately while a background task refreshes
+# them, so the first caller after expiry doesn't pay full API latency.
+_SWR_WINDOW_SECONDS = 120
+
+# Sort order for item-level issues (critical > error > warning > info);
+# unknown severities sort last.
+_SEVERITY_RANK = {'critical': 0, 'error': 1, 'warning': 2, 'info': 3}
+
+# Content API product IDs look like 'online:en:DK:{offerId}'; anything that
+# doesn't match is a guaranteed 404, so it is rejected locally before
+# spending a network round-trip on it.
+_PID_RE = re.compile(r'^(online|local):[a-z]{2}:[A-Z]{2}:.+$')
+
+# Backoff policy for transient API failures (rate limits / server errors)
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 5
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_CAP_SECONDS = 30.0
+_BACKOFF_JITTER_SECONDS = 0.25
+
+
+class Issue(NamedTuple):
+    """Item-level issue record.
+
+    A NamedTuple is several times lighter than a fresh 5-key dict per issue
+    (merchants can carry thousands); records are converted to dicts only at
+    the JSON boundary."""
+    code: Optional[str]
+    severity: Optional[str]
+    description: Optional[str]
+    attribute: str
+    documentation: str
+
+
 class MerchantCenterInput(TypedDict):
     product_id: str # Merchant Center product ID (often 'online:en:DK:{EAN}' or similar)
     category: Optional[str]
     days: Optional[int] # Used for mocked performance report
+    include_mocks: Optional[bool] # Include the mocked performance/price sections
 
 class MerchantCenterTool(BaseTool):
     """Tool for retrieving data from Google Merchant Center"""
@@ -38,36 +126,65 @@ class MerchantCenterTool(BaseTool):
         # self.config = config or {} # config parameter is no longer used for these core settings
         self.credentials_path = os.environ.get("MERCHANT_CENTER_CREDENTIALS")
         self.merchant_id = os.environ.get("MERCHANT_CENTER_ID")
-        self.client = self._initialize_client()
-        if self.client:
-            logger.info("Merchant Center client initialized successfully.")
-        else:
-            logger.error("Merchant Center client failed to initialize.")
+        # Bounded pool for offloading the blocking googleapiclient calls;
+        # caps fan-out so bursts of concurrent invokes can't exhaust threads.
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="merchant-center")
+        # TTL cache of API responses keyed by (kind, merchant_id, product_id);
+        # hits skip the network round-trip and quota burn entirely.
+        self._cache: Dict[tuple, tuple] = {}
+        # Keys with a background stale-while-revalidate refresh in flight,
+        # so concurrent stale hits schedule at most one refresh each.
+        self._refreshing: set = set()
+        # Single-flight registry: cache-miss fetches currently on the wire,
+        # keyed like the cache. Concurrent misses for the same product await
+        # the same future instead of racing identical API calls.
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Client construction is deferred to first access (see client property)
+        self._client = None
+        self._client_initialized = False
+        # Memoized Resource objects (client.products() builds a fresh one
+        # on every call); populated alongside the client.
+        self._products = None
+        self._productstatuses = None
+
+    @property
+    def client(self):
+        """Merchant Center API client, built lazily on first access.
+
+        Deferring initialization means configured-but-unused tool instances
+        don't pay credential parsing and discovery-client construction at
+        orchestrator startup."""
+        if not self._client_initialized:
+            self._client_initialized = True
+            self._client = self._initialize_client()
+            if self._client:
+                self._products = self._client.products()
+                self._productstatuses = self._client.productstatuses()
+                logger.info("Merchant Center client initialized successfully.")
+            else:
+                logger.error("Merchant Center client failed to initialize.")
+        return self._client
 
     def _initialize_client(self):
         """Initialize Merchant Center API client"""
         if not self.credentials_path or not os.path.exists(self.credentials_path):
-            logger.error(f"Merchant Center credentials path not found or invalid: {self.credentials_path}")
+            logger.error("Merchant Center credentials path not found or invalid: %s", self.credentials_path)
             return None
         if not self.merchant_id:
             logger.error("Merchant Center ID (MERCHANT_CENTER_ID) not configured.")
             return None
 
         try:
-            logger.debug(f"Initializing Merchant Center client with credentials: {self.credentials_path} for merchant: {self.merchant_id}")
-            credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path,
-                scopes=['https://www.googleapis.com/auth/content']
-            )
-            # Use content API v2.1
-            return build('content', 'v2.1', credentials=credentials)
+            logger.debug("Initializing Merchant Center client with credentials: %s for merchant: %s", self.credentials_path, self.merchant_id)
+            # Use content API v2.1 (memoized across instances)
+            return _build_client(self.credentials_path)
         except Exception as e:
-            logger.exception(f"Error initializing Merchant Center client: {e}")
+            logger.exception("Error initializing Merchant Center client: %s", e)
             return None
 
     async def invoke(self, args: MerchantCenterInput) -> Dict[str, Any]:
         """Invoke the Merchant Center tool"""
-        logger.info(f"Invoking MerchantCenterTool with args: {args}")
+        logger.info("Invoking MerchantCenterTool with args: %s", args)
         if not self.client:
             logger.error("Merchant Center client not initialized, cannot invoke tool.")
             return {"error": "Merchant Center client not initialized"}
@@ -75,155 +192,383 @@ class MerchantCenterTool(BaseTool):
         product_id = args.get("product_id")
         category = args.get("category") # Used for mocked price insights
         days = args.get("days", 30) # Used for mocked performance report
+        include_mocks = args.get("include_mocks", False)
 
         if not product_id:
             logger.error("Missing required argument: product_id")
             return {"error": "product_id is required"}
 
+        if not _PID_RE.match(product_id):
+            logger.error("Invalid product_id format: %s", product_id)
+            return {"error": f"Invalid product_id format: {product_id}"}
+
         results = {}
         errors = {} # Collect errors from different parts
 
-        # Get product data
-        product_data_result = self._get_product_data(product_id)
+        # Run the two independent API round-trips concurrently; each blocks on
+        # network I/O for hundreds of ms, so sequential execution roughly
+        # doubles end-to-end latency.
+        product_data_result, product_issues_result = await asyncio.gather(
+            self._aget_product_data(product_id),
+            self._aget_product_issues(product_id),
+            return_exceptions=True
+        )
+        if isinstance(product_data_result, Exception):
+            product_data_result = {"error": f"Error getting product data for {product_id}: {product_data_result}"}
+        if isinstance(product_issues_result, Exception):
+            product_issues_result = {"error": f"Error getting product issues for {product_id}: {product_issues_result}"}
+
         if "error" in product_data_result:
             errors["product_data_error"] = product_data_result["error"]
         else:
             results["product_data"] = product_data_result
 
-        # Get product issues
-        product_issues_result = self._get_product_issues(product_id)
         if "error" in product_issues_result:
             errors["product_issues_error"] = product_issues_result["error"]
         else:
             results["product_issues"] = product_issues_result
 
-        # Get performance report (Mocked for now, requires Performance Reports API)
-        # No real API call, so less error handling needed here for now
-        results["performance_report"] = self._get_performance_report(product_id, days)
-
-        # Get price insights (Mocked for now, requires Price Competitiveness API)
-        # No real API call, so less error handling needed here for now
-        results["price_insights"] = self._get_competitor_price_insights(product_id, category)
+        # The performance report and price insights are mocked (the real APIs
+        # need separate access), so they are opt-in: callers that don't
+        # consume them shouldn't pay for building the nested dicts.
+        if include_mocks:
+            results["performance_report"] = self._get_performance_report(product_id, days)
+            results["price_insights"] = self._get_competitor_price_insights(product_id, category)
 
         if errors:
-            logger.warning(f"MerchantCenterTool invocation finished with errors: {errors}")
+            logger.warning("MerchantCenterTool invocation finished with errors: %s", errors)
             results["errors"] = errors # Include collected errors in the final result
 
-        logger.info(f"MerchantCenterTool invocation finished. Returning keys: {list(results.keys())}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("MerchantCenterTool invocation finished. Returning keys: %s", list(results.keys()))
         return results # Return results even if some parts failed
 
-    def _get_product_data(self, product_id):
-        """Get product data from Merchant Center"""
-        logger.info(f"Fetching product data for product_id: {product_id}")
+    async def invoke_many(self, args_list: List[MerchantCenterInput]) -> List[Dict[str, Any]]:
+        """Batch variant of invoke: fetch data and statuses for many products
+        with two custombatch calls instead of 2N sequential requests.
+
+        Content API v2.1 ships up to 1000 entries per custombatch call, so
+        for N products the 2N HTTPS round-trips collapse to 2."""
+        logger.info("Invoking MerchantCenterTool batch for %d products", len(args_list))
+        if not self.client:
+            logger.error("Merchant Center client not initialized, cannot invoke tool.")
+            return [{"error": "Merchant Center client not initialized"} for _ in args_list]
+
+        product_ids = [args.get("product_id") for args in args_list]
+        valid_ids = [pid for pid in product_ids if pid]
+
+        loop = asyncio.get_running_loop()
+        products_resp, statuses_resp = await asyncio.gather(
+            loop.run_in_executor(self._executor, self._custombatch_get, "products", valid_ids),
+            loop.run_in_executor(self._executor, self._custombatch_get, "productstatuses", valid_ids),
+            return_exceptions=True
+        )
+
+        # Distribute batched responses back by batchId (index into valid_ids)
+        data_by_id = self._index_batch_entries(products_resp, valid_ids, "product")
+        status_by_id = self._index_batch_entries(statuses_resp, valid_ids, "productStatus")
+
+        results_list = []
+        for args, product_id in zip(args_list, product_ids):
+            if not product_id:
+                results_list.append({"error": "product_id is required"})
+                continue
+
+            results = {}
+            errors = {}
+
+            product_data = data_by_id.get(product_id)
+            if product_data is None:
+                errors["product_data_error"] = f"Error getting product data for {product_id} (batch)"
+            else:
+                self._cache_put(("product_data", self.merchant_id, product_id), product_data)
+                results["product_data"] = product_data
+
+            status = status_by_id.get(product_id)
+            if status is None:
+                errors["product_issues_error"] = f"Error getting product issues for {product_id} (batch)"
+            else:
+                processed = self._process_product_issues(status)
+                self._cache_put(("product_issues", self.merchant_id, product_id), processed)
+                results["product_issues"] = processed
+
+            if args.get("include_mocks", False):
+                results["performance_report"] = self._get_performance_report(product_id, args.get("days", 30))
+                results["price_insights"] = self._get_competitor_price_insights(product_id, args.get("category"))
+
+            if errors:
+                results["errors"] = errors
+            results_list.append(results)
+
+        logger.info("MerchantCenterTool batch invocation finished for %d products.", len(results_list))
+        return results_list
+
+    def _custombatch_get(self, kind, product_ids):
+        """Issue one products/productstatuses custombatch GET for all ids."""
+        resource = self._products if kind == "products" else self._productstatuses
+        body = {
+            "entries": [
+                {"batchId": i, "merchantId": self.merchant_id, "productId": pid, "method": "get"}
+                for i, pid in enumerate(product_ids)
+            ]
+        }
+        logger.debug("Executing %s.custombatch for %d products", kind, len(product_ids))
+        return self._execute_with_backoff(resource.custombatch(body=body))
+
+    def _index_batch_entries(self, response, product_ids, payload_key):
+        """Map a custombatch response's entries back to product_id -> payload."""
+        if isinstance(response, Exception):
+            logger.error("custombatch request failed: %s", response)
+            return {}
+        indexed = {}
+        for entry in (response or {}).get("entries", []):
+            batch_id = entry.get("batchId")
+            payload = entry.get(payload_key)
+            if payload is None or batch_id is None or batch_id >= len(product_ids):
+                if entry.get("errors"):
+                    logger.warning("custombatch entry %s returned errors: %s", batch_id, entry['errors'])
+                continue
+            indexed[product_ids[batch_id]] = payload
+        return indexed
+
+    async def _aget_product_data(self, product_id):
+        """Async wrapper: run the blocking product fetch off the event loop."""
+        return await self._aget_with_swr(
+            "product_data", _PRODUCT_DATA_TTL_SECONDS, self._get_product_data, product_id)
+
+    async def _aget_product_issues(self, product_id):
+        """Async wrapper: run the blocking status fetch off the event loop."""
+        return await self._aget_with_swr(
+            "product_issues", _PRODUCT_ISSUES_TTL_SECONDS, self._get_product_issues, product_id)
+
+    async def _aget_with_swr(self, kind, ttl, fetch, product_id):
+        """Serve fresh cache hits directly, stale-but-recent hits with a
+        background refresh, and only await the network when the entry is
+        missing or too old."""
+        key = (kind, self.merchant_id, product_id)
+        entry = self._cache.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                return value
+            if age < ttl + _SWR_WINDOW_SECONDS:
+                logger.debug("Serving stale %s for %s and revalidating in background.", kind, product_id)
+                self._schedule_refresh(key, fetch, product_id)
+                return value
+        # Collapse concurrent misses for the same key to one API call
+        # (single-flight): followers await the leader's future.
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await pending
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
         try:
-            # Note: product_id format is crucial, e.g., 'online:en:DK:1234567890123'
-            logger.debug(f"Executing products().get() for merchantId: {self.merchant_id}, productId: {product_id}")
-            response = self.client.products().get(
-                merchantId=self.merchant_id,
-                productId=product_id
-            ).execute()
-            logger.info(f"Successfully retrieved product data for {product_id}")
-            return response
+            value = await loop.run_in_executor(self._executor, fetch, product_id)
         except Exception as e:
-            error_message = f"Error getting product data for {product_id}: {e}"
-            error_details = str(e)
-            # Check for specific Google API errors
-            if GoogleHttpError and isinstance(e, GoogleHttpError):
-                 try:
-                     # Attempt to parse error details
-                     error_content = json.loads(e.content).get('error', {})
-                     error_message = f"Google API Error getting product data: {error_content.get('message', str(e))}"
-                     if error_content.get('code') == 404:
-                         error_message = f"Product not found in Merchant Center: {product_id}"
-                         logger.warning(error_message)
-                         return {"error": error_message} # Return specific error for not found
-                 except:
-                     error_message = f"Google API Error getting product data: {e}" # Fallback
-
-            logger.exception(error_message)
-            return {"error": error_message, "details": error_details}
+            if not future.done():
+                future.set_exception(e)
+            # Followers re-raise via the future; suppress the unawaited-
+            # exception warning when nobody else was waiting.
+            future.exception()
+            raise
+        else:
+            if not future.done():
+                future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _schedule_refresh(self, key, fetch, product_id):
+        """Kick off a single deduplicated background refresh for a stale key."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def _refresh():
+            try:
+                loop = asyncio.get_running_loop()
+                # The fetcher repopulates the cache on success.
+                await loop.run_in_executor(self._executor, fetch, product_id)
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", key, e)
+            finally:
+                self._refreshing.discard(key)
+
+        asyncio.create_task(_refresh())
+
+    def _execute_with_backoff(self, request):
+        """Execute an API request, retrying 429/5xx responses with capped
+        exponential backoff plus jitter.
+
+        Runs on an executor thread, so time.sleep here doesn't block the
+        event loop. Non-retryable errors propagate to the caller's handler."""
+        for attempt in range(_MAX_RETRIES):
+            try:
+                return request.execute()
+            except Exception as e:
+                status = getattr(getattr(e, 'resp', None), 'status', None)
+                retryable = (GoogleHttpError and isinstance(e, GoogleHttpError)
+                             and status in _RETRYABLE_STATUS_CODES)
+                if not retryable or attempt == _MAX_RETRIES - 1:
+                    raise
+                delay = min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * (2 ** attempt))
+                delay += random.uniform(0, _BACKOFF_JITTER_SECONDS)
+                logger.warning("Merchant Center request returned %s, retrying in %.2fs (attempt %d/%d)", status, delay, attempt + 1, _MAX_RETRIES)
+                time.sleep(delay)
+
+    def _cache_get(self, key, ttl):
+        """Return the cached value for key if it is younger than ttl, else None.
+
+        Expired entries are kept in place until they also age out of the
+        SWR window: a background revalidation re-enters the fetcher (which
+        calls this), and evicting here would strip the stale value out from
+        under concurrent callers, forcing them onto the full miss path and
+        a duplicate API call for the whole refresh round-trip."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        age = time.monotonic() - fetched_at
+        if age >= ttl:
+            if age >= ttl + _SWR_WINDOW_SECONDS:
+                self._cache.pop(key, None)
+            return None
+        return value
 
-    def _get_product_issues(self, product_id):
-        """Get product data quality issues"""
-        logger.info(f"Fetching product issues for product_id: {product_id}")
+    def _cache_put(self, key, value):
+        self._cache[key] = (value, time.monotonic())
+
+    def _execute(self, request, context):
+        """Execute a request and translate failures once.
+
+        Returns (data, None) on success, or (None, error) where error is a
+        dict with 'code' (HTTP status if parseable, else None), 'message'
+        and 'details'. Centralizes the GoogleHttpError isinstance check and
+        error-content parsing that every call path used to duplicate."""
         try:
-            logger.debug(f"Executing productstatuses().get() for merchantId: {self.merchant_id}, productId: {product_id}")
-            response = self.client.productstatuses().get(
-                 merchantId=self.merchant_id,
-                 productId=product_id
-            ).execute()
-            logger.info(f"Successfully retrieved product status for {product_id}")
-            return self._process_product_issues(response)
+            return self._execute_with_backoff(request), None
         except Exception as e:
-            error_message = f"Error getting product issues for {product_id}: {e}"
-            error_details = str(e)
+            code = None
+            message = f"Error {context}: {e}"
             if GoogleHttpError and isinstance(e, GoogleHttpError):
-                 try:
-                     error_content = json.loads(e.content).get('error', {})
-                     error_message = f"Google API Error getting product issues: {error_content.get('message', str(e))}"
-                     if error_content.get('code') == 404:
-                         error_message = f"Product status not found in Merchant Center: {product_id}"
-                         logger.warning(error_message)
-                         # It's okay if status isn't found, might just mean no issues or not processed yet
-                         # Return an empty success structure instead of error
-                         return {"has_critical_issues": False, "issue_count": 0, "issues": []}
-                 except:
-                     error_message = f"Google API Error getting product issues: {e}" # Fallback
-
-            logger.exception(error_message)
-            return {"error": error_message, "details": error_details}
+                try:
+                    error_content = _loads(e.content).get('error', {})
+                    code = error_content.get('code')
+                    message = f"Google API Error {context}: {error_content.get('message', str(e))}"
+                except Exception:
+                    message = f"Google API Error {context}: {e}" # Fallback
+            return None, {"code": code, "message": message, "details": str(e)}
+
+    def _get_product_data(self, product_id):
+        """Get product data from Merchant Center"""
+        cache_key = ("product_data", self.merchant_id, product_id)
+        cached = self._cache_get(cache_key, _PRODUCT_DATA_TTL_SECONDS)
+        if cached is not None:
+            logger.debug("Product data cache hit for %s", product_id)
+            return cached
+
+        logger.info("Fetching product data for product_id: %s", product_id)
+        # Note: product_id format is crucial, e.g., 'online:en:DK:1234567890123'
+        logger.debug("Executing products().get() for merchantId=%s productId=%s", self.merchant_id, product_id)
+        response, error = self._execute(
+            self._products.get(merchantId=self.merchant_id, productId=product_id),
+            "getting product data")
+        if error is None:
+            logger.info("Successfully retrieved product data for %s", product_id)
+            self._cache_put(cache_key, response)
+            return response
+
+        if error["code"] == 404:
+            error_message = f"Product not found in Merchant Center: {product_id}"
+            logger.warning(error_message)
+            return {"error": error_message} # Return specific error for not found
+        logger.error(error["message"])
+        return {"error": error["message"], "details": error["details"]}
+
+    def _get_product_issues(self, product_id):
+        """Get product data quality issues"""
+        cache_key = ("product_issues", self.merchant_id, product_id)
+        cached = self._cache_get(cache_key, _PRODUCT_ISSUES_TTL_SECONDS)
+        if cached is not None:
+            logger.debug("Product issues cache hit for %s", product_id)
+            return cached
+
+        logger.info("Fetching product issues for product_id: %s", product_id)
+        logger.debug("Executing productstatuses().get() for merchantId=%s productId=%s", self.merchant_id, product_id)
+        response, error = self._execute(
+            self._productstatuses.get(merchantId=self.merchant_id, productId=product_id),
+            "getting product issues")
+        if error is None:
+            logger.info("Successfully retrieved product status for %s", product_id)
+            processed = self._process_product_issues(response)
+            self._cache_put(cache_key, processed)
+            return processed
+
+        if error["code"] == 404:
+            logger.warning("Product status not found in Merchant Center: %s", product_id)
+            # It's okay if status isn't found, might just mean no issues or not processed yet
+            # Return an empty success structure instead of error
+            return {"has_critical_issues": False, "issue_count": 0, "issues": []}
+        logger.error(error["message"])
+        return {"error": error["message"], "details": error["details"]}
 
     def _process_product_issues(self, response):
         """Process product issues response"""
         logger.debug("Processing product issues response.")
-        issues = []
         has_critical_issues = False
 
         item_level_issues = response.get('itemLevelIssues', [])
         if not item_level_issues:
             logger.info("No item level issues found in product status response.")
 
+        # Place each issue directly into its severity bucket — O(n) versus
+        # building one list and comparison-sorting it afterwards.
+        # Pre-bind the rank lookup and use a single bound .get per issue so
+        # the loop body avoids repeated method/attribute lookups.
+        buckets = [[], [], [], [], []]
+        rank_of = _SEVERITY_RANK.get
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for issue in item_level_issues:
-            severity = issue.get('severity')
-            code = issue.get('code')
-            description = issue.get('description')
-            attribute = issue.get('attributeName', 'N/A') # Correct field name
-            documentation = issue.get('documentation', 'N/A')
+            get = issue.get
+            severity = get('severity')
+            code = get('code')
+            description = get('description')
+            attribute = get('attributeName', 'N/A') # Correct field name
+            documentation = get('documentation', 'N/A')
 
-            logger.debug(f"Found issue: code={code}, severity={severity}, attribute={attribute}, desc={description}")
+            if debug_enabled:
+                logger.debug("Found issue: code=%s, severity=%s, attribute=%s, desc=%s", code, severity, attribute, description)
 
-            if severity in ['error', 'critical']:
+            if severity in ('error', 'critical'):
                 has_critical_issues = True
 
-            issues.append({
-                "code": code,
-                "severity": severity,
-                "description": description,
-                "attribute": attribute,
-                "documentation": documentation
-            })
+            buckets[rank_of(severity, 4)].append(
+                Issue(code, severity, description, attribute, documentation))
 
-        # Sort issues by severity (critical > error > warning > info)
-        severity_order = {'critical': 0, 'error': 1, 'warning': 2, 'info': 3}
-        issues.sort(key=lambda x: severity_order.get(x.get('severity'), 4))
+        # Concatenation preserves the severity order (critical > error > warning > info);
+        # convert to dicts only here, at the serialization boundary.
+        issues = [issue._asdict() for bucket in buckets for issue in bucket]
 
         processed_issues = {
             "has_critical_issues": has_critical_issues,
             "issue_count": len(issues),
             "issues": issues
         }
-        logger.debug(f"Finished processing product issues. Found {len(issues)} issues. Has critical: {has_critical_issues}")
+        logger.debug("Finished processing product issues. Found %d issues. Has critical: %s", len(issues), has_critical_issues)
         return processed_issues
 
     def _get_performance_report(self, product_id, days):
         """Get Shopping performance report (Mocked)"""
         # Requires Performance Reports API access which is separate
         # Returning mock data structure
-        logger.warning(f"Merchant Center performance report is mocked for product {product_id}")
-        # Simple hash-based mock data generation
-        impressions_mock = 1000 + hash(product_id) % 5000
-        clicks_mock = 50 + hash(product_id) % 200
-        conversions_mock = 5 + hash(product_id) % 50
+        logger.warning("Merchant Center performance report is mocked for product %s", product_id)
+        # Simple hash-based mock data generation (hash computed once)
+        h = hash(product_id)
+        impressions_mock = 1000 + h % 5000
+        clicks_mock = 50 + h % 200
+        conversions_mock = 5 + h % 50
         ctr_mock = round((clicks_mock / impressions_mock * 100.0) if impressions_mock > 0 else 0.0, 2)
         conv_rate_mock = round((conversions_mock / clicks_mock * 100.0) if clicks_mock > 0 else 0.0, 2)
 
@@ -241,8 +586,8 @@ class MerchantCenterTool(BaseTool):
                 "category_avg_conversion_rate": 10.0,
             },
             "search_term_insights": [ # Mock search terms
-                 {"term": f"mock term {hash(product_id)%10}", "impressions": 100, "clicks": 10, "conversions": 2},
-                 {"term": f"another mock {hash(product_id)%20}", "impressions": 80, "clicks": 5, "conversions": 1},
+                 {"term": f"mock term {h % 10}", "impressions": 100, "clicks": 10, "conversions": 2},
+                 {"term": f"another mock {h % 20}", "impressions": 80, "clicks": 5, "conversions": 1},
             ]
         }
 
@@ -250,7 +595,7 @@ class MerchantCenterTool(BaseTool):
         """Get competitive price insights (Mocked)"""
         # Requires Price Competitiveness API access which is separate
         # Returning mock data structure
-        logger.warning(f"Merchant Center price insights are mocked for product {product_id}")
+        logger.warning("Merchant Center price insights are mocked for product %s", product_id)
         mock_price = 80.0 + hash(product_id) % 40
         mock_benchmark = 75.0 + hash(category or product_id) % 30
         price_diff_percent = round(((mock_price - mock_benchmark) / mock_benchmark) * 100.0 if mock_benchmark > 0 else 0.0, 1)
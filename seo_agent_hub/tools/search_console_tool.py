@@ -1,8 +1,28 @@
+import asyncio
 import os
+import json # Added for potential error parsing
 import logging # Added import
-from datetime import datetime, timedelta
+import time
+
+# orjson parses API error payloads much faster than stdlib json and accepts
+# bytes directly (no decode step); fall back to stdlib when not installed.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+from datetime import date, timedelta
+from functools import lru_cache
 from typing import Dict, Any, TypedDict, Optional, List
 
+# Heavy dependencies are imported lazily so SEMrush-only agents never pay
+# for protobuf/httplib2 (google client stack) or the pandas/NumPy import
+# at process startup; see _load_google_deps/_load_heavy_deps.
+service_account = None
+build = None
+np = None
+pd = None
+
 # A2A BaseTool import (assuming it's available in the environment)
 try:
     from a2a.tools import BaseTool
@@ -12,19 +32,113 @@ except ImportError:
         async def invoke(self, args: Dict[str, Any]) -> Dict[str, Any]:
             return {"error": "a2a package not found"}
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-# Import Google API errors if available
-try:
-    from googleapiclient.errors import HttpError as GoogleHttpError
-except ImportError:
-    GoogleHttpError = None # Define as None if google-api-client is not installed
+GoogleHttpError = None # Resolved together with the google imports below
 
 # Setup logging
 logger = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
+def _load_google_deps():
+    """Import the Google client stack on first use."""
+    global service_account, build, GoogleHttpError
+    if build is not None:
+        return
+    from google.oauth2 import service_account as _service_account
+    from googleapiclient.discovery import build as _build
+    # Import Google API errors if available
+    try:
+        from googleapiclient.errors import HttpError as _GoogleHttpError
+    except ImportError:
+        _GoogleHttpError = None # Define as None if google-api-client is not installed
+    service_account = _service_account
+    build = _build
+    GoogleHttpError = _GoogleHttpError
+
+
+def _load_heavy_deps():
+    """Import numpy/pandas on first use (the tiny path never needs them)."""
+    global np, pd
+    if np is None:
+        import numpy
+        import pandas
+        np = numpy
+        pd = pandas
+
+
+@lru_cache(maxsize=4)
+def _build_client(credentials_path):
+    """Build (and memoize) a Search Console client for a service-account key.
+
+    Cached at module level so worker processes constructing many
+    SearchConsoleTool instances share one compiled client instead of
+    re-parsing the key file and discovery document each time."""
+    _load_google_deps()
+    credentials = service_account.Credentials.from_service_account_file(
+        credentials_path,
+        scopes=['https://www.googleapis.com/auth/webmasters.readonly'] # Use readonly scope
+    )
+    try:
+        # static_discovery compiles the discovery document bundled with the
+        # client library instead of fetching it over the network.
+        return build('searchconsole', 'v1', credentials=credentials,
+                     cache_discovery=False, static_discovery=True)
+    except TypeError:
+        # Older google-api-python-client releases lack static_discovery
+        return build('searchconsole', 'v1', credentials=credentials, cache_discovery=False)
+
+
+# Default lifetime for cached query responses; GSC data for a fixed date
+# range barely changes within an hour, and agent runs tend to re-query the
+# same product URLs repeatedly.
+_DEFAULT_CACHE_TTL_SECONDS = 3600
+_CACHE_MAX_ENTRIES = 1024
+
+# Maximum rows per search-analytics request (the API's hard cap); pages
+# are fetched with startRow until a short page signals the end.
+_PAGE_ROW_LIMIT = 25000
+
+# Responses at or below this many rows skip the pandas machinery; a plain
+# loop is cheaper than DataFrame construction for a handful of rows, and
+# obscure product pages (the long tail of a catalog) land here.
+_TINY_ROW_THRESHOLD = 4
+
+# Optional JIT-compiled aggregation for very large responses; numba isn't a
+# declared dependency, so its absence simply keeps the pandas groupby path.
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Row count above which the numba kernel (when available) beats groupby
+_NUMBA_ROW_THRESHOLD = 4000
+
+_agg_kernel = None
+
+
+def _get_agg_kernel():
+    """Compile (once per process) the per-query accumulation kernel."""
+    global _agg_kernel
+    if _agg_kernel is None:
+        @numba.njit(cache=True, boundscheck=False)
+        def _agg(qids, dids, impressions, clicks, positions, n_queries):
+            out_impr = np.zeros(n_queries)
+            out_clicks = np.zeros(n_queries)
+            out_wpos = np.zeros(n_queries)
+            out_dev = np.zeros((n_queries, 3))
+            for i in range(qids.shape[0]):
+                q = qids[i]
+                out_impr[q] += impressions[i]
+                out_clicks[q] += clicks[i]
+                out_wpos[q] += positions[i] * impressions[i]
+                d = dids[i]
+                if d < 3:
+                    out_dev[q, d] += impressions[i]
+            return out_impr, out_clicks, out_wpos, out_dev
+        _agg_kernel = _agg
+    return _agg_kernel
+
+
 class SearchConsoleInput(TypedDict):
     product_url: Optional[str]
     product_id: Optional[str]
@@ -38,6 +152,21 @@ class SearchConsoleTool(BaseTool):
         # self.config = config or {} # config parameter is no longer used for these core settings
         self.credentials_path = os.environ.get("SEARCH_CONSOLE_CREDENTIALS")
         self.property_url = os.environ.get("SEARCH_CONSOLE_PROPERTY")
+        # TTL cache of raw API responses keyed by (siteUrl, filter
+        # expression, days, end_date); hits skip the network round-trip.
+        # Caching the raw response (smaller than search_data) keeps the
+        # processing logic free to evolve without invalidating entries.
+        self.cache_ttl_seconds = (config or {}).get("cache_ttl_seconds", _DEFAULT_CACHE_TTL_SECONDS)
+        self._cache: Dict[tuple, tuple] = {}
+        # Single-flight registry: cache-miss fetches currently on the wire,
+        # keyed like the cache. Concurrent misses for the same query await
+        # the same future instead of racing identical API calls.
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Product-scoped instances can fix their page filter up front via
+        # config; invoke then reuses the precomputed filter instead of
+        # rebuilding it (and the f-string path) on every call.
+        cfg = config or {}
+        self._default_page_filter = self._build_page_filter(cfg.get("product_url"), cfg.get("product_id"))
         self.client = self._initialize_client()
         if self.client:
             logger.info("Search Console client initialized successfully.")
@@ -55,15 +184,45 @@ class SearchConsoleTool(BaseTool):
 
         try:
             logger.debug(f"Initializing Search Console client with credentials: {self.credentials_path} for property: {self.property_url}")
-            credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path,
-                scopes=['https://www.googleapis.com/auth/webmasters.readonly'] # Use readonly scope
-            )
-            return build('searchconsole', 'v1', credentials=credentials)
+            # Memoized across instances; uses the bundled discovery document
+            return _build_client(self.credentials_path)
         except Exception as e:
             logger.exception(f"Error initializing Search Console client: {e}")
             return None
 
+    @staticmethod
+    def _build_page_filter(product_url, product_id):
+        """Build the page dimension filter for a product, or None if neither
+        identifier was given."""
+        if product_url:
+            logger.debug(f"Using page filter based on product_url: {product_url}")
+            return {"dimension": "page", "operator": "equals", "expression": product_url}
+        if product_id:
+            # Assuming a common URL structure like /products/{product_id}
+            # This might need adjustment based on the actual URL structure
+            page_path = f"/products/{product_id}" # TODO: Make this configurable?
+            logger.debug(f"Using page filter based on product_id: {product_id} (path: {page_path})")
+            return {"dimension": "page", "operator": "contains", "expression": page_path}
+        return None
+
+    def _cache_get(self, key):
+        """Return the cached response for key if still fresh, else None."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        if time.monotonic() - fetched_at >= self.cache_ttl_seconds:
+            self._cache.pop(key, None)
+            return None
+        return value
+
+    def _cache_put(self, key, value):
+        if len(self._cache) >= _CACHE_MAX_ENTRIES:
+            # Evict the oldest insertion (dicts preserve insert order);
+            # crude but enough to bound memory for long-lived processes.
+            self._cache.pop(next(iter(self._cache)), None)
+        self._cache[key] = (value, time.monotonic())
+
     async def invoke(self, args: SearchConsoleInput) -> Dict[str, Any]:
         """Invoke the Search Console tool"""
         logger.info(f"Invoking SearchConsoleTool with args: {args}")
@@ -75,26 +234,24 @@ class SearchConsoleTool(BaseTool):
         product_id = args.get("product_id")
         days = args.get("days", 90)
 
-        if not product_url and not product_id:
+        if not product_url and not product_id and self._default_page_filter is None:
             logger.error("Missing required argument: either product_url or product_id must be provided.")
             return {"error": "Either product_url or product_id must be provided"}
 
-        # Calculate date range
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        # Calculate date range; date.today() + isoformat() is cheaper than
+        # datetime.now() + strftime and yields one stable value per day,
+        # which keeps the TTL-cache key deterministic across a batch.
+        end = date.today()
+        end_date = end.isoformat()
+        start_date = (end - timedelta(days=days)).isoformat()
         logger.debug(f"Calculated date range: {start_date} to {end_date}")
 
-        # Determine page filter
-        page_filter = None
-        if product_url:
-            page_filter = {"dimension": "page", "operator": "equals", "expression": product_url}
-            logger.debug(f"Using page filter based on product_url: {product_url}")
-        elif product_id:
-            # Assuming a common URL structure like /products/{product_id}
-            # This might need adjustment based on the actual URL structure
-            page_path = f"/products/{product_id}" # TODO: Make this configurable?
-            page_filter = {"dimension": "page", "operator": "contains", "expression": page_path}
-            logger.debug(f"Using page filter based on product_id: {product_id} (path: {page_path})")
+        # Determine page filter (per-call arguments win over the
+        # constructor-scoped default)
+        if product_url or product_id:
+            page_filter = self._build_page_filter(product_url, product_id)
+        else:
+            page_filter = self._default_page_filter
 
         if not page_filter:
              logger.error("Could not determine page filter from provided arguments.")
@@ -106,30 +263,51 @@ class SearchConsoleTool(BaseTool):
                 'startDate': start_date,
                 'endDate': end_date,
                 'dimensions': ['query', 'device', 'page'], # Include page to verify filter worked if needed
-                'rowLimit': 500, # Increased limit, consider making configurable
+                'rowLimit': _PAGE_ROW_LIMIT,
                 'dimensionFilterGroups': [{
                     'filters': [page_filter]
                 }]
             }
-            logger.debug(f"Executing Search Console query for siteUrl: {self.property_url}, body: {request_body}")
-
-            response = self.client.searchanalytics().query(
-                siteUrl=self.property_url,
-                body=request_body
-            ).execute()
-
-            logger.info(f"Successfully retrieved Search Console data for filter: {page_filter['expression']}")
-
-            # Process the response
-            search_data = self._process_search_analytics(response)
-
-            # Get keyword opportunities based on the search data
-            opportunities = self._get_keyword_opportunities(search_data)
-
-            final_result = {
-                "search_data": search_data,
-                "keyword_opportunities": opportunities
-            }
+            cache_key = (self.property_url, page_filter['expression'], days, end_date)
+            response = self._cache_get(cache_key)
+            if response is None:
+                # Collapse concurrent misses for the same key to one API
+                # call (single-flight): followers await the leader's future.
+                pending = self._inflight.get(cache_key)
+                if pending is not None:
+                    logger.debug(f"Awaiting in-flight Search Console query for filter: {page_filter['expression']}")
+                    response = await pending
+                else:
+                    future = asyncio.get_running_loop().create_future()
+                    self._inflight[cache_key] = future
+                    try:
+                        logger.debug(f"Executing Search Console query for siteUrl: {self.property_url}, body: {request_body}")
+                        # Blocking googleapiclient calls run on a worker thread
+                        # so concurrent agent coroutines aren't stalled.
+                        response = await asyncio.to_thread(self._fetch_all_rows, request_body)
+                        self._cache_put(cache_key, response)
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                        # Followers re-raise via the future; suppress the
+                        # unawaited-exception warning when nobody waited.
+                        future.exception()
+                        raise
+                    else:
+                        if not future.done():
+                            future.set_result(response)
+                    finally:
+                        self._inflight.pop(cache_key, None)
+
+                    logger.info(f"Successfully retrieved Search Console data for filter: {page_filter['expression']}")
+            else:
+                logger.debug(f"Search Console cache hit for filter: {page_filter['expression']}")
+
+            # Process the response (aggregates and opportunity selection
+            # both come out of one groupby pass). The pandas work is pure
+            # CPU, so it runs off the event loop too; NumPy releases the
+            # GIL for most kernels, letting other tasks overlap.
+            final_result = await asyncio.to_thread(self._process_search_analytics, response)
             logger.info(f"SearchConsoleTool invocation finished successfully.")
             return final_result
 
@@ -139,19 +317,39 @@ class SearchConsoleTool(BaseTool):
             if GoogleHttpError and isinstance(e, GoogleHttpError):
                  # Attempt to parse error details from Google API error
                  try:
-                     error_details = json.loads(e.content).get('error', {}).get('message', str(e))
+                     error_details = _loads(e.content).get('error', {}).get('message', str(e))
                      error_message = f"Google API Error getting Search Console data: {error_details}"
                  except:
                      error_message = f"Google API Error getting Search Console data: {e}" # Fallback
             logger.exception(error_message)
             return {"error": error_message, "details": str(e)}
 
-    def _process_search_analytics(self, response):
-        """Process Search Console response data"""
-        logger.debug("Processing Search Console analytics response.")
-        if 'rows' not in response or not response['rows']:
-            logger.warning("No rows found in Search Console response.")
-            return {
+    def _fetch_all_rows(self, request_body):
+        """Fetch every result page for a query and return a merged response.
+
+        The API caps a single request at 25000 rows; paging with startRow
+        until a short page arrives avoids silent truncation while keeping
+        the number of round-trips minimal (one for typical product pages)."""
+        rows: List[Dict[str, Any]] = []
+        start_row = 0
+        while True:
+            request_body['startRow'] = start_row
+            page = self.client.searchanalytics().query(
+                siteUrl=self.property_url,
+                body=request_body
+            ).execute()
+            page_rows = page.get('rows', [])
+            rows.extend(page_rows)
+            if len(page_rows) < _PAGE_ROW_LIMIT:
+                break
+            start_row += _PAGE_ROW_LIMIT
+        return {'rows': rows}
+
+    @staticmethod
+    def _empty_result():
+        """Result shape for responses that yielded no usable rows."""
+        return {
+            "search_data": {
                 "query_count": 0,
                 "total_impressions": 0,
                 "total_clicks": 0,
@@ -160,137 +358,322 @@ class SearchConsoleTool(BaseTool):
                 "dominant_device": None,
                 "device_breakdown": {},
                 "queries": []
-            }
+            },
+            "keyword_opportunities": {"high_impression_low_ctr": [], "already_ranking": []}
+        }
+
+    def _process_search_analytics(self, response):
+        """Process Search Console response data.
+
+        Returns the combined search_data + keyword_opportunities result;
+        the opportunity selection reuses the aggregated query frame from the
+        same groupby instead of re-iterating a materialized query list."""
+        logger.debug("Processing Search Console analytics response.")
+        if 'rows' not in response or not response['rows']:
+            logger.warning("No rows found in Search Console response.")
+            return self._empty_result()
+
+        rows = response.get('rows', [])
+        if len(rows) <= _TINY_ROW_THRESHOLD:
+            return self._process_tiny(rows)
+        _load_heavy_deps()
+        # Scan the rows into flat parallel columns (structure of arrays)
+        # and build the DataFrame from those. np.fromiter with a known
+        # count allocates each numeric column exactly once; if any row is
+        # malformed the whole-batch attempt raises and the filtering scan
+        # below handles it row by row (the rare case).
+        try:
+            query_col = [row['keys'][0] for row in rows]
+            device_col = [row['keys'][1] for row in rows]
+            # page = row['keys'][2] # Page is filtered, less relevant for aggregation here
+            n = len(rows)
+            impressions_arr = np.fromiter((row.get('impressions', 0) for row in rows), dtype=np.float64, count=n)
+            clicks_arr = np.fromiter((row.get('clicks', 0) for row in rows), dtype=np.float64, count=n)
+            position_arr = np.fromiter((row.get('position', 0) for row in rows), dtype=np.float64, count=n)
+        except (IndexError, KeyError, TypeError, ValueError):
+            query_col, device_col, impressions_arr, clicks_arr, position_arr = self._scan_rows_filtered(rows)
+
+        logger.debug(f"Processed {len(rows)} rows from Search Console response.")
+        if not query_col:
+            return self._empty_result()
+
+        if numba is not None and len(query_col) > _NUMBA_ROW_THRESHOLD:
+            grouped, device_totals = self._aggregate_with_numba(
+                query_col, device_col, impressions_arr, clicks_arr, position_arr)
+        else:
+            df = pd.DataFrame({
+                'query': query_col,
+                'device': device_col,
+                'impressions': impressions_arr,
+                'clicks': clicks_arr,
+                'position': position_arr,
+            })
+            df['wpos'] = df['position'] * df['impressions'] # Weighted position
+
+            grouped = df.groupby('query', sort=False).agg(
+                impressions=('impressions', 'sum'),
+                clicks=('clicks', 'sum'),
+                wpos=('wpos', 'sum'),
+            )
+            # Dominant device per query, by impressions for that query
+            device_pivot = df.pivot_table(index='query', columns='device', values='impressions',
+                                          aggfunc='sum', fill_value=0.0)
+            grouped['dominant_device'] = device_pivot.idxmax(axis=1).where(device_pivot.sum(axis=1) > 0, None)
+            # Overall totals per device (unknown devices are ignored,
+            # matching the previous dict-guarded accumulation)
+            device_totals = (df.groupby('device', sort=False)['impressions'].sum()
+                             .reindex(("MOBILE", "DESKTOP", "TABLET"), fill_value=0.0))
+
+        impressions = grouped['impressions'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grouped['ctr'] = np.where(impressions > 0, grouped['clicks'].to_numpy() / impressions * 100.0, 0.0)
+            grouped['avg_position'] = np.where(impressions > 0, grouped['wpos'].to_numpy() / impressions, 0.0)
+
+        # Top 50 queries by impressions (partial selection, no full Python
+        # sort); rounding and int conversion happen once on whole columns
+        # instead of per record, and to_dict boxes native Python scalars.
+        top_queries = grouped.nlargest(50, 'impressions').round({'ctr': 2, 'avg_position': 1})
+        top_queries[['impressions', 'clicks']] = top_queries[['impressions', 'clicks']].astype('int64')
+        sorted_queries = (
+            top_queries.reset_index()
+            [['query', 'impressions', 'clicks', 'ctr', 'avg_position', 'dominant_device']]
+            .to_dict('records')
+        )
+
+        # Overall totals in one vectorized pass (per-query sums equal the
+        # per-row sums, so this works for both aggregation paths)
+        total_impressions = float(impressions.sum())
+        total_clicks = float(grouped['clicks'].sum())
+        weighted_position_sum = float(grouped['wpos'].sum())
+        avg_ctr = (total_clicks / total_impressions) * 100.0 if total_impressions > 0 else 0.0
+        avg_position = weighted_position_sum / total_impressions if total_impressions > 0 else 0.0
+
+        # Device breakdown percentage
+        dominant_device_overall = str(device_totals.idxmax()) if device_totals.max() > 0 else None
+        if total_impressions > 0:
+            device_breakdown = (device_totals / total_impressions * 100.0).round(1).to_dict()
+        else:
+            device_breakdown = {k: 0.0 for k in device_totals.index}
+
+        search_data = {
+            "query_count": int(len(grouped)),
+            "total_impressions": int(total_impressions),
+            "total_clicks": int(total_clicks),
+            "avg_ctr": round(avg_ctr, 2),
+            "avg_position": round(avg_position, 1),
+            "dominant_device": dominant_device_overall,
+            "device_breakdown": device_breakdown,
+            "queries": sorted_queries # Top 50 queries
+        }
+        logger.debug(f"Finished processing search analytics. Queries found: {len(grouped)}")
+        return {
+            "search_data": search_data,
+            "keyword_opportunities": self._select_opportunities(grouped)
+        }
 
-        queries = {}
-        devices = {"MOBILE": 0, "DESKTOP": 0, "TABLET": 0}
+    @staticmethod
+    def _aggregate_with_numba(query_col, device_col, impressions_arr, clicks_arr, position_arr):
+        """Aggregate per-query sums with the JIT kernel.
+
+        Interns query strings to dense integer ids, runs the compiled
+        linear scan, and rebuilds the same grouped frame the pandas path
+        produces. Used only above _NUMBA_ROW_THRESHOLD rows, where the
+        near-C loop beats groupby's dispatch and hashing."""
+        n = len(query_col)
+        qid_map: Dict[str, int] = {}
+        qids = np.empty(n, dtype=np.int64)
+        for i, query in enumerate(query_col):
+            qids[i] = qid_map.setdefault(query, len(qid_map))
+        device_ids = {'MOBILE': 0, 'DESKTOP': 1, 'TABLET': 2}
+        get_device_id = device_ids.get
+        dids = np.fromiter((get_device_id(d, 3) for d in device_col), dtype=np.int64, count=n)
+
+        kernel = _get_agg_kernel()
+        out_impr, out_clicks, out_wpos, out_dev = kernel(
+            qids, dids, impressions_arr, clicks_arr, position_arr, len(qid_map))
+
+        device_names = np.array(('MOBILE', 'DESKTOP', 'TABLET'), dtype=object)
+        dominant = device_names[out_dev.argmax(axis=1)]
+        dominant[out_dev.sum(axis=1) <= 0] = None
+
+        grouped = pd.DataFrame(
+            {'impressions': out_impr, 'clicks': out_clicks, 'wpos': out_wpos, 'dominant_device': dominant},
+            index=pd.Index(qid_map.keys(), name='query'),
+        )
+        device_totals = pd.Series(out_dev.sum(axis=0), index=("MOBILE", "DESKTOP", "TABLET"))
+        return grouped, device_totals
+
+    @staticmethod
+    def _scan_rows_filtered(rows):
+        """Row-by-row column scan that skips malformed rows.
+
+        Fallback for responses where the whole-batch np.fromiter ingestion
+        tripped over a bad row."""
+        query_col: List[str] = []
+        device_col: List[str] = []
+        impressions_col: List[float] = []
+        clicks_col: List[float] = []
+        position_col: List[float] = []
+        for row in rows:
+            try:
+                keys = row['keys']
+                query = keys[0]
+                device = keys[1]
+                impressions = float(row.get('impressions', 0))
+                clicks = float(row.get('clicks', 0))
+                position = float(row.get('position', 0))
+            except (IndexError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping row due to processing error: {e}. Row data: {row}")
+                continue # Skip malformed rows
+            query_col.append(query)
+            device_col.append(device)
+            impressions_col.append(impressions)
+            clicks_col.append(clicks)
+            position_col.append(position)
+        return (query_col, device_col, np.asarray(impressions_col),
+                np.asarray(clicks_col), np.asarray(position_col))
+
+    def _process_tiny(self, rows):
+        """Aggregate a handful of rows with a plain Python loop.
+
+        Specialized fast path for low-traffic pages: DataFrame construction
+        and groupby dispatch dwarf the actual work at this size. Produces
+        the same result shape as the vectorized path."""
+        queries: Dict[str, list] = {}
+        devices = {"MOBILE": 0.0, "DESKTOP": 0.0, "TABLET": 0.0}
         total_impressions = 0.0
         total_clicks = 0.0
         weighted_position_sum = 0.0
-        total_rows_processed = 0
 
-        for row in response.get('rows', []):
-            total_rows_processed += 1
+        for row in rows:
             try:
                 query = row['keys'][0]
                 device = row['keys'][1]
-                # page = row['keys'][2] # Page is filtered, less relevant for aggregation here
-
                 impressions = float(row.get('impressions', 0))
                 clicks = float(row.get('clicks', 0))
-                ctr = float(row.get('ctr', 0)) * 100.0 # Convert to percentage
                 position = float(row.get('position', 0))
-
-                if query not in queries:
-                    queries[query] = {"impressions": 0.0, "clicks": 0.0, "position_sum": 0.0, "devices": {"MOBILE": 0.0, "DESKTOP": 0.0, "TABLET": 0.0}}
-
-                queries[query]["impressions"] += impressions
-                queries[query]["clicks"] += clicks
-                queries[query]["position_sum"] += position * impressions # Weighted position
-                if device in queries[query]["devices"]: # Check if device key exists
-                    queries[query]["devices"][device] += impressions
-
-                total_impressions += impressions
-                total_clicks += clicks
-                weighted_position_sum += position * impressions
-                if device in devices: devices[device] += impressions
             except (IndexError, KeyError, TypeError, ValueError) as e:
                 logger.warning(f"Skipping row due to processing error: {e}. Row data: {row}")
                 continue # Skip malformed rows
 
-        logger.debug(f"Processed {total_rows_processed} rows from Search Console response.")
+            agg = queries.setdefault(query, [0.0, 0.0, 0.0, {"MOBILE": 0.0, "DESKTOP": 0.0, "TABLET": 0.0}])
+            agg[0] += impressions
+            agg[1] += clicks
+            agg[2] += position * impressions # Weighted position
+            if device in agg[3]:
+                agg[3][device] += impressions
 
-        sorted_queries = []
-        for query, data in queries.items():
-            avg_pos = data["position_sum"] / data["impressions"] if data["impressions"] > 0 else 0.0
-            ctr = (data["clicks"] / data["impressions"]) * 100.0 if data["impressions"] > 0 else 0.0
-            # Find dominant device based on impressions for that query
-            dominant_device = max(data["devices"].items(), key=lambda item: item[1])[0] if any(d > 0 for d in data["devices"].values()) else None
+            total_impressions += impressions
+            total_clicks += clicks
+            weighted_position_sum += position * impressions
+            if device in devices:
+                devices[device] += impressions
+
+        if not queries:
+            return self._empty_result()
 
+        sorted_queries = []
+        high_impression_low_ctr = []
+        already_ranking = []
+        for query, (impressions, clicks, wpos, query_devices) in queries.items():
+            ctr = (clicks / impressions) * 100.0 if impressions > 0 else 0.0
+            avg_position = wpos / impressions if impressions > 0 else 0.0
+            dominant_device = max(query_devices.items(), key=lambda item: item[1])[0] if any(v > 0 for v in query_devices.values()) else None
             sorted_queries.append({
                 "query": query,
-                "impressions": int(data["impressions"]),
-                "clicks": int(data["clicks"]),
+                "impressions": int(impressions),
+                "clicks": int(clicks),
                 "ctr": round(ctr, 2),
-                "avg_position": round(avg_pos, 1),
+                "avg_position": round(avg_position, 1),
                 "dominant_device": dominant_device
             })
+            # Same selection thresholds as _select_opportunities
+            if impressions > 100 and ctr < 2.0 and avg_position > 5.0:
+                high_impression_low_ctr.append({
+                    "query": query,
+                    "impressions": int(impressions),
+                    "current_ctr": round(ctr, 2),
+                    "current_position": round(avg_position, 1),
+                    "potential_clicks_gain": max(0, int(impressions * 0.05) - int(clicks))
+                })
+            if avg_position <= 10.0:
+                already_ranking.append({
+                    "query": query,
+                    "position": round(avg_position, 1),
+                    "clicks": int(clicks),
+                    "impressions": int(impressions),
+                    "ctr": round(ctr, 2)
+                })
 
-        # Sort aggregated queries by impressions
         sorted_queries.sort(key=lambda x: x["impressions"], reverse=True)
+        high_impression_low_ctr.sort(key=lambda x: x["impressions"], reverse=True)
+        already_ranking.sort(key=lambda x: x["position"])
 
-        # Calculate overall averages
         avg_ctr = (total_clicks / total_impressions) * 100.0 if total_impressions > 0 else 0.0
         avg_position = weighted_position_sum / total_impressions if total_impressions > 0 else 0.0
-        # Find overall dominant device
-        dominant_device_overall = max(devices.items(), key=lambda item: item[1])[0] if any(d > 0 for d in devices.values()) else None
-        # Calculate device breakdown percentage
+        dominant_device_overall = max(devices.items(), key=lambda item: item[1])[0] if any(v > 0 for v in devices.values()) else None
         device_breakdown = {k: round((v / total_impressions) * 100.0, 1) if total_impressions > 0 else 0.0 for k, v in devices.items()}
 
-        processed_data = {
-            "query_count": len(queries),
-            "total_impressions": int(total_impressions),
-            "total_clicks": int(total_clicks),
-            "avg_ctr": round(avg_ctr, 2),
-            "avg_position": round(avg_position, 1),
-            "dominant_device": dominant_device_overall,
-            "device_breakdown": device_breakdown,
-            "queries": sorted_queries[:50] # Return Top 50 queries
+        return {
+            "search_data": {
+                "query_count": len(queries),
+                "total_impressions": int(total_impressions),
+                "total_clicks": int(total_clicks),
+                "avg_ctr": round(avg_ctr, 2),
+                "avg_position": round(avg_position, 1),
+                "dominant_device": dominant_device_overall,
+                "device_breakdown": device_breakdown,
+                "queries": sorted_queries
+            },
+            "keyword_opportunities": {
+                "high_impression_low_ctr": high_impression_low_ctr[:10],
+                "already_ranking": already_ranking[:10]
+            }
         }
-        logger.debug(f"Finished processing search analytics. Queries found: {len(queries)}")
-        return processed_data
 
-    def _get_keyword_opportunities(self, search_data):
-        """Identify keyword opportunities from processed search data"""
-        logger.debug("Identifying keyword opportunities from search data.")
-        high_impression_low_ctr = []
-        already_ranking = []
-
-        if not search_data or not search_data.get("queries"):
-            logger.warning("No query data available for identifying keyword opportunities.")
-            return {"high_impression_low_ctr": [], "already_ranking": []}
+    def _select_opportunities(self, grouped):
+        """Identify keyword opportunities from the aggregated query frame.
 
-        for query_data in search_data.get("queries", []):
-            try:
-                impressions = query_data.get("impressions", 0)
-                ctr = query_data.get("ctr", 0.0)
-                position = query_data.get("avg_position", 1000.0) # Default high if missing
-                query_text = query_data.get("query")
-
-                if not query_text: continue # Skip if query text is missing
-
-                # High impression but low CTR (e.g., > 100 impressions, < 2% CTR, position > 5)
-                # Added position check to avoid flagging top results with naturally lower CTR
-                if impressions > 100 and ctr < 2.0 and position > 5.0:
-                    potential_clicks = int(impressions * 0.05) # Potential if CTR improved to 5%
-                    high_impression_low_ctr.append({
-                        "query": query_text,
-                        "impressions": impressions,
-                        "current_ctr": ctr,
-                        "current_position": position,
-                        "potential_clicks_gain": max(0, potential_clicks - query_data.get("clicks", 0)) # Gain over current
-                    })
-
-                # Already ranking well (e.g., position <= 10)
-                if position <= 10.0:
-                     already_ranking.append({
-                        "query": query_text,
-                        "position": position,
-                        "clicks": query_data.get("clicks", 0),
-                        "impressions": impressions,
-                        "ctr": ctr
-                     })
-            except (TypeError, KeyError) as e:
-                logger.warning(f"Skipping query opportunity due to data error: {e}. Query data: {query_data}")
-                continue
-
-        # Sort opportunities
-        high_impression_low_ctr.sort(key=lambda x: x["impressions"], reverse=True)
-        already_ranking.sort(key=lambda x: x["position"])
+        Boolean masks over the groupby result replace the former second pass
+        over a materialized top-50 list, so selection sees every distinct
+        query and adds no extra Python-level iteration."""
+        logger.debug("Identifying keyword opportunities from search data.")
+        impressions = grouped['impressions']
+        ctr = grouped['ctr']
+        position = grouped['avg_position']
+
+        # High impression but low CTR (e.g., > 100 impressions, < 2% CTR, position > 5)
+        # Position check avoids flagging top results with naturally lower CTR
+        low_ctr = (grouped[(impressions > 100) & (ctr < 2.0) & (position > 5.0)]
+                   .nlargest(10, 'impressions')
+                   .round({'ctr': 2, 'avg_position': 1}))
+        # Gain over current if CTR improved to 5%
+        low_ctr['potential_clicks_gain'] = (
+            (low_ctr['impressions'] * 0.05).astype('int64') - low_ctr['clicks'].astype('int64')
+        ).clip(lower=0)
+        low_ctr['impressions'] = low_ctr['impressions'].astype('int64')
+        high_impression_low_ctr = (
+            low_ctr.reset_index()
+            .rename(columns={'ctr': 'current_ctr', 'avg_position': 'current_position'})
+            [['query', 'impressions', 'current_ctr', 'current_position', 'potential_clicks_gain']]
+            .to_dict('records')
+        )
+
+        # Already ranking well (e.g., position <= 10)
+        ranking = (grouped[position <= 10.0]
+                   .nsmallest(10, 'avg_position')
+                   .round({'ctr': 2, 'avg_position': 1}))
+        ranking[['impressions', 'clicks']] = ranking[['impressions', 'clicks']].astype('int64')
+        already_ranking = (
+            ranking.reset_index()
+            .rename(columns={'avg_position': 'position'})
+            [['query', 'position', 'clicks', 'impressions', 'ctr']]
+            .to_dict('records')
+        )
 
         opportunities = {
-            "high_impression_low_ctr": high_impression_low_ctr[:10], # Top 10 opportunities
-            "already_ranking": already_ranking[:10] # Top 10 ranking keywords
+            "high_impression_low_ctr": high_impression_low_ctr, # Top 10 opportunities
+            "already_ranking": already_ranking # Top 10 ranking keywords
             # Could add 'rising_queries' if historical data comparison is implemented
         }
         logger.debug(f"Identified keyword opportunities: {len(high_impression_low_ctr)} low CTR, {len(already_ranking)} already ranking.")
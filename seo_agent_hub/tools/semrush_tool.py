@@ -1,7 +1,28 @@
+import asyncio
+import codecs
+import csv
+import io
 import os
 import logging # Added import
+import time
+from functools import lru_cache
+from itertools import chain
 from typing import Dict, Any, TypedDict, Optional, List
 import requests # Using requests directly as semrush-api-client might not be installed/configured
+from requests.adapters import HTTPAdapter, Retry
+
+# Optional async HTTP client: shares one connection pool across calls and
+# lets independent requests overlap on the event loop.
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Optional: moves trend-string tokenization into C for catalog-scale runs.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # A2A BaseTool import (assuming it's available in the environment)
 try:
@@ -16,6 +37,226 @@ except ImportError:
 logger = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# Keyword overviews are stable for hours; cached invoke results skip both
+# paid API hits entirely for repeat keywords within a catalog run.
+_RESULT_CACHE_TTL_SECONDS = 6 * 3600
+_RESULT_CACHE_MAX_ENTRIES = 10_000
+
+# Negative-result cache: identical requests short-circuit after an inline
+# API error instead of re-hitting the endpoint. NOTHING FOUND is retried
+# after a minute; quota exhaustion is held longer since hammering the API
+# while the balance is zero only risks rate-limit bans.
+_ERROR_CACHE_TTL_SECONDS = 60
+_QUOTA_ERROR_TTL_SECONDS = 600
+_ERROR_CACHE_MAX_ENTRIES = 5_000
+
+
+# Chunk size for streamed response bodies: large enough to amortize
+# per-chunk overhead, small enough to stay cache-friendly.
+_STREAM_CHUNK_BYTES = 16384
+
+
+def _iter_decoded_lines(response):
+    """Yield text lines from a streamed response body.
+
+    Decodes raw byte chunks through an incremental UTF-8 decoder and
+    splits on newlines at chunk boundaries, so no full-body str (and no
+    per-byte iter_lines bookkeeping) is ever materialized."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    for chunk in response.iter_content(_STREAM_CHUNK_BYTES):
+        buffer += decoder.decode(chunk)
+        if '\n' in buffer:
+            *lines, buffer = buffer.split('\n')
+            for line in lines:
+                yield line.rstrip('\r')
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer.rstrip('\r')
+
+
+@lru_cache(maxsize=64)
+def _normalize_headers(header_fields: tuple) -> tuple:
+    """Normalize a SEMrush header row to snake_case keys.
+
+    Columns are fixed per export_columns argument, so after the first
+    response per endpoint this is one hash+lookup instead of per-char
+    string work; the cached tuple is reused directly as dict keys."""
+    return tuple(h.strip().lower().replace(' ', '_') for h in header_fields)
+
+
+# Deletes currency symbols, thousands separators and spaces in one C-level
+# pass instead of a chain of .replace() string copies.
+_CPC_STRIP = str.maketrans('', '', '$,€£¥ ')
+
+
+def _parse_cpc(value: str) -> float:
+    """Parse a CPC field that may carry currency symbols or thousands separators."""
+    cleaned = value.translate(_CPC_STRIP)
+    return float(cleaned) if cleaned else 0.0
+
+
+def _parse_trend(value: str) -> List[int]:
+    """Parse SEMrush's comma-separated 12-month trend string.
+
+    numpy tokenizes and converts in C; the listcomp fallback covers
+    environments without it."""
+    if not value:
+        return []
+    if np is not None:
+        return np.fromstring(value, sep=',', dtype=np.int32).tolist()
+    return [int(t) for t in value.split(',')]
+
+
+# Per-endpoint column schemas: (export column code, output key, converter),
+# in export_columns order. Rows are converted positionally while parsing,
+# so invoke consumes typed dicts instead of re-running .get()/int()/float()
+# per field afterwards.
+SCHEMAS = {
+    "phrase_this": [
+        ("Ph", "keyword", str),
+        ("Nq", "search_volume", int),
+        ("Cp", "cpc", _parse_cpc),
+        ("Co", "competition", float),
+        ("Nr", "number_of_results", int),
+        ("Td", "trend", _parse_trend),
+    ],
+    "phrase_related": [
+        ("Ph", "keyword", str),
+        ("Nq", "search_volume", int),
+        ("Rl", "relevance", float),
+    ],
+}
+# Bulk overview endpoint returns the same columns, one row per phrase.
+SCHEMAS["phrase_these"] = SCHEMAS["phrase_this"]
+
+# Micro-batching: how long to wait for more keywords before flushing, and
+# the per-request phrase cap SEMrush accepts on phrase_these.
+_BATCH_WINDOW_SECONDS = 0.02
+_BATCH_MAX_KEYWORDS = 100
+
+
+class _BatchedKeywordFetcher:
+    """Coalesces concurrent overview lookups into bulk phrase_these calls.
+
+    Callers enqueue a (keyword, database) pair and await a future; pending
+    lookups are flushed every 20 ms, or immediately once 100 keywords are
+    queued, as one API request per database. This amortizes the
+    handshake+request overhead across the batch when the orchestrator
+    processes many products concurrently."""
+
+    def __init__(self, tool: "SEMrushTool"):
+        self._tool = tool
+        self._pending: List[tuple] = []  # (keyword, database, future)
+        # The sleeping window timer and running flushes are tracked
+        # separately: only the timer is ever cancelled, so an in-flight
+        # flush always runs to completion and settles its batch's futures.
+        self._timer_task: Optional[asyncio.Task] = None
+        self._flush_tasks: set = set()
+
+    async def fetch(self, keyword: str, database: str) -> Dict[str, Any]:
+        """Queue a keyword overview lookup and await its batched result."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((keyword, database, future))
+        if len(self._pending) >= _BATCH_MAX_KEYWORDS:
+            if self._timer_task is not None and not self._timer_task.done():
+                self._timer_task.cancel()
+            self._start_flush()
+        elif self._timer_task is None or self._timer_task.done():
+            self._timer_task = asyncio.create_task(self._drain_after_window())
+        return await future
+
+    def _start_flush(self):
+        task = asyncio.create_task(self._flush())
+        # Keep a strong reference until the flush finishes so the task
+        # can't be garbage-collected mid-request.
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _drain_after_window(self):
+        await asyncio.sleep(_BATCH_WINDOW_SECONDS)
+        # Clear before flushing so keywords enqueued while the flush is in
+        # flight arm a fresh timer instead of waiting on this spent one.
+        self._timer_task = None
+        await self._flush()
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            by_db: Dict[str, List[tuple]] = {}
+            for keyword, database, future in batch:
+                by_db.setdefault(database, []).append((keyword, future))
+
+            for database, entries in by_db.items():
+                params = {
+                    "type": "phrase_these",
+                    "phrase": ";".join(keyword for keyword, _ in entries),
+                    "database": database,
+                    "export_columns": "Ph,Nq,Cp,Co,Nr,Td",
+                }
+                logger.debug("Flushing SEMrush batch of %d keywords for db '%s'", len(entries), database)
+                try:
+                    result = await self._tool._make_api_request("phrase_these", params)
+                except Exception as e:
+                    for _, future in entries:
+                        if not future.done():
+                            future.set_exception(e)
+                        future.exception()
+                    continue
+
+                rows = result.get("data", []) if "error" not in result else []
+                by_keyword = {row.get("keyword", "").lower(): row for row in rows}
+                for keyword, future in entries:
+                    if future.done():
+                        continue
+                    row = by_keyword.get(keyword.lower())
+                    if row is not None:
+                        future.set_result(row)
+                    elif "error" in result:
+                        future.set_result(result)
+                    else:
+                        future.set_result({"error": f"No SEMrush data returned for keyword '{keyword}'"})
+        finally:
+            # Whatever happened above (including cancellation), no caller
+            # may be left awaiting a future that will never settle.
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result({"error": "SEMrush batch flush did not complete"})
+            # Keywords enqueued while this flush ran still need a drain.
+            if self._pending and (self._timer_task is None or self._timer_task.done()):
+                self._timer_task = asyncio.create_task(self._drain_after_window())
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """Shared pooled session for the requests fallback path.
+
+    Memoized at module level so every SEMrushTool instance reuses one
+    connection pool (and its established TLS state) instead of each
+    handshaking separately."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3,
+                          status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+    return session
+
+
+# Exception tuples spanning both HTTP backends so the handler chain in
+# _make_api_request stays a single code path.
+if httpx is not None:
+    _TIMEOUT_ERRORS = (requests.exceptions.Timeout, httpx.TimeoutException)
+    _HTTP_STATUS_ERRORS = (requests.exceptions.HTTPError, httpx.HTTPStatusError)
+    _REQUEST_ERRORS = (requests.exceptions.RequestException, httpx.RequestError)
+else:
+    _TIMEOUT_ERRORS = (requests.exceptions.Timeout,)
+    _HTTP_STATUS_ERRORS = (requests.exceptions.HTTPError,)
+    _REQUEST_ERRORS = (requests.exceptions.RequestException,)
+
 
 class SEMrushInput(TypedDict):
     keyword: str
@@ -30,83 +271,232 @@ class SEMrushTool(BaseTool):
         # self.config = config or {} # config parameter is no longer used for these core settings
         self.api_key = os.environ.get("SEMRUSH_API_KEY")
         self.base_url = os.environ.get("SEMRUSH_BASE_URL", "https://api.semrush.com") # Use env var or default
+        # Hoisted per-call constants: endpoint URL and the params every
+        # request shares, merged into call params instead of mutating them.
+        self._url = f"{self.base_url}/analytics/v1/"
+        self._base_params = {"key": self.api_key}
+        # Pooled async client when httpx is installed; otherwise requests
+        # calls are pushed to a worker thread so the event loop stays free.
+        self._client = self._build_async_client() if httpx is not None else None
+        # Pooled session for the requests fallback: reuses the TCP+TLS
+        # connection across calls instead of handshaking per request, and
+        # retries transient failures (429/5xx) with backoff. Shared across
+        # instances via the module-level memo.
+        self._session = _get_session()
+        # Single-flight registry: concurrent identical lookups await one
+        # future instead of issuing duplicate API calls (and burning
+        # duplicate API units).
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # TTL cache of final invoke results keyed by normalized
+        # (keyword, database); hits skip both paid API hits entirely.
+        self._result_cache: Dict[tuple, tuple] = {}
+        # Negative-result cache keyed on (endpoint, phrase, database);
+        # entries carry their own expiry since the TTL depends on the error.
+        self._error_cache: Dict[tuple, tuple] = {}
+        # Opt-in micro-batching of overview lookups through phrase_these;
+        # off by default so single-product runs keep their latency profile.
+        batching = os.environ.get("SEMRUSH_BATCH_KEYWORDS", "").lower() in ("1", "true", "yes")
+        self._batcher = _BatchedKeywordFetcher(self) if batching else None
         if self.api_key:
             logger.info(f"SEMrushTool initialized with API key, using base URL: {self.base_url}")
         else:
             logger.error("SEMrush API key (SEMRUSH_API_KEY) not found in config or environment.")
 
+    def _fetch_streaming(self, url, params, endpoint_type):
+        """Fetch on the pooled session, parsing the CSV as lines stream in.
+
+        stream=True avoids buffering the whole body into one str before a
+        second parsing pass; each line is decoded, parsed and discarded,
+        halving peak memory for large display_limit responses. Runs on a
+        worker thread (blocking I/O)."""
+        response = self._session.get(url, params=params, timeout=(5, 30), stream=True)
+        try:
+            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+            logger.debug("SEMrush API request successful (Status: %s), streaming body.", response.status_code)
+            return self._parse_response_lines(_iter_decoded_lines(response), endpoint_type, params)
+        finally:
+            response.close()
+
+    def _parse_response_lines(self, lines, endpoint_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a SEMrush response from an iterator of text lines.
+
+        Checks the first line for the API's inline error format, then feeds
+        the line stream straight into the CSV parser."""
+        first_line = next(lines, None)
+        if first_line is None or not first_line.strip():
+            logger.warning(f"No data parsed from SEMrush response for endpoint {endpoint_type}, params {params}.")
+            return {"data": []}
+
+        # SEMrush inline errors always lead the body ("ERROR <code> :: ...");
+        # a prefix check beats slicing and substring-scanning the line.
+        if first_line.startswith("ERROR"):
+            logger.error(f"SEMrush API returned an error message: {first_line}")
+            # Attempt to extract a cleaner error message if possible
+            error_match = first_line.split("::")
+            clean_error = error_match[1].strip() if len(error_match) > 1 else first_line
+            return {"error": f"SEMrush API error: {clean_error}"}
+
+        parsed_data = self._parse_rows(csv.reader(chain([first_line], lines), delimiter=';'),
+                                       schema=SCHEMAS.get(endpoint_type))
+
+        if not parsed_data:
+            logger.warning(f"No data parsed from SEMrush response for endpoint {endpoint_type}, params {params}.")
+            # Return empty list or specific message instead of error? Depends on expected behavior.
+            # For now, returning an empty list within a 'data' key for consistency.
+            return {"data": []}
+
+        # SEMrush often returns single row for phrase_this, list for others
+        # Return the first item if it was likely a single-row response, else the list
+        if endpoint_type == "phrase_this" and len(parsed_data) == 1:
+            return parsed_data[0]
+        return {"data": parsed_data} # Wrap list results in a 'data' key
+
     def _parse_semrush_csv(self, csv_text: str) -> List[Dict[str, str]]:
-        """Parses SEMrush semicolon-separated CSV text into a list of dictionaries."""
-        lines = csv_text.strip().split('\n')
-        if len(lines) < 2:
-            logger.warning("SEMrush response has less than 2 lines (header + data).")
-            return [] # Return empty list if no data rows
+        """Parses SEMrush semicolon-separated CSV text into a list of dictionaries.
 
-        headers = [h.strip().lower().replace(' ', '_') for h in lines[0].split(';')] # Normalize headers
-        parsed_data = []
+        Uses the C-implemented csv reader in a single pass over the buffer
+        instead of splitting by newline and then by field, which built an
+        intermediate list of lists and called strip() per field."""
+        return self._parse_rows(csv.reader(io.StringIO(csv_text.strip()), delimiter=';'))
 
-        for i, line in enumerate(lines[1:]): # Iterate through data rows
-            data_row = [d.strip() for d in line.split(';')]
-            if len(headers) != len(data_row):
-                logger.warning(f"Row {i+1}: Mismatch between headers ({len(headers)}) and data ({len(data_row)}). Skipping row. Headers: {headers}, Data: {data_row}")
-                continue # Skip rows with mismatch
-            parsed_data.append(dict(zip(headers, data_row)))
+    def _parse_rows(self, reader, schema=None) -> List[Dict[str, Any]]:
+        """Build row dicts from an open csv.reader (header row first).
 
+        With a schema, fields are indexed positionally and converted through
+        the bound constructors in one pass; without one, rows become plain
+        str dicts keyed on normalized header names."""
+        headers = next(reader, None)
+        if headers is None:
+            logger.warning("SEMrush response has less than 2 lines (header + data).")
+            return []
+
+        data_rows = list(reader)
+        if schema is not None:
+            n_fields = len(schema)
+            parsed_data = []
+            mismatched = 0
+            for row in data_rows:
+                if len(row) != n_fields:
+                    mismatched += 1
+                    continue
+                # Conversion failures are warned per row above and must not
+                # be lumped into the field-count mismatch summary.
+                try:
+                    parsed_data.append({key: convert(row[i])
+                                        for i, (_, key, convert) in enumerate(schema)})
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Could not convert SEMrush row {row}: {e}")
+        else:
+            headers = _normalize_headers(tuple(headers)) # Normalize headers (memoized)
+            n_headers = len(headers)
+            # Comprehension keeps the row loop in C-level iteration; rows whose
+            # field count doesn't match the header are dropped.
+            parsed_data = [dict(zip(headers, row)) for row in data_rows if len(row) == n_headers]
+            mismatched = len(data_rows) - len(parsed_data)
+
+        if mismatched:
+            logger.warning(f"Skipped {mismatched} SEMrush rows with field counts not matching headers: {headers}")
+        if not parsed_data:
+            logger.warning("SEMrush response has less than 2 lines (header + data).")
         return parsed_data
 
-    def _make_api_request(self, endpoint_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Helper function to make SEMrush API requests and parse the response."""
+    @staticmethod
+    def _build_async_client():
+        """Construct the shared httpx client with explicit pool limits.
+
+        HTTP/2 multiplexes the overview and related requests over one
+        connection and amortizes the TLS handshake; it needs the optional
+        h2 package, so fall back to HTTP/1.1 when that isn't installed."""
+        timeout = httpx.Timeout(30.0, connect=5.0)
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        try:
+            return httpx.AsyncClient(http2=True, timeout=timeout, limits=limits)
+        except ImportError:
+            return httpx.AsyncClient(timeout=timeout, limits=limits)
+
+    async def aclose(self):
+        """Close the pooled HTTP client (no-op on the requests fallback)."""
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _make_api_request(self, endpoint_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Make a SEMrush API request, deduplicating concurrent identical calls.
+
+        Multiple agents in one run frequently look up the same keyword at
+        the same time; followers await the leader's future instead of
+        issuing a duplicate request."""
         if not self.api_key:
             logger.error("SEMrush API key not configured.")
             return {"error": "SEMrush API key not configured"}
 
-        params["key"] = self.api_key
-        # Ensure 'type' is included for analytics endpoint
-        if 'type' not in params:
-            params['type'] = endpoint_type # Use endpoint_type if 'type' param is missing
+        error_key = (endpoint_type, params.get("phrase"), params.get("database"))
+        cached_error = self._error_cache_get(error_key)
+        if cached_error is not None:
+            logger.debug("SEMrush error cache hit for %s", error_key)
+            return cached_error
 
-        # Construct the URL based on the endpoint type
-        # Assuming analytics/v1/ for now, adjust if other endpoints are used
-        url = f"{self.base_url}/analytics/v1/"
-        logger.debug(f"Making SEMrush API request to {url} with params: {params}")
+        key = (endpoint_type, tuple(sorted(params.items())))
+        pending = self._inflight.get(key)
+        if pending is not None:
+            logger.debug("Awaiting in-flight SEMrush request for %s", key[0])
+            return await pending
 
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
         try:
-            response = requests.get(url, params=params, timeout=30) # Added timeout
-            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+            result = await self._request_and_parse(endpoint_type, params)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            # Followers re-raise via the future; suppress the unawaited-
+            # exception warning when nobody else was waiting.
+            future.exception()
+            raise
+        else:
+            if not future.done():
+                future.set_result(result)
+            if "error" in result:
+                self._error_cache_put(error_key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _request_and_parse(self, endpoint_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Helper function to make SEMrush API requests and parse the response."""
+
+        # Merge the shared key into a fresh dict instead of mutating the
+        # caller's params; URL is precomputed in __init__.
+        merged = self._base_params | params
+        # Ensure 'type' is included for analytics endpoint
+        if 'type' not in merged:
+            merged['type'] = endpoint_type # Use endpoint_type if 'type' param is missing
+
+        url = self._url
+        logger.debug("Making SEMrush API request to %s with params: %s", url, merged)
 
-            logger.debug(f"SEMrush API request successful (Status: {response.status_code}). Response text length: {len(response.text)}")
-
-            # Check for explicit error messages in the response text (SEMrush format varies)
-            if "ERROR" in response.text[:100]: # Check beginning of response for common error patterns
-                 logger.error(f"SEMrush API returned an error message: {response.text}")
-                 # Attempt to extract a cleaner error message if possible
-                 error_match = response.text.split("::")
-                 clean_error = error_match[1].strip() if len(error_match) > 1 else response.text
-                 return {"error": f"SEMrush API error: {clean_error}"}
-
-            # Parse the CSV response
-            parsed_data = self._parse_semrush_csv(response.text)
-
-            if not parsed_data:
-                 logger.warning(f"No data parsed from SEMrush response for endpoint {endpoint_type}, params {params}.")
-                 # Return empty list or specific message instead of error? Depends on expected behavior.
-                 # For now, returning an empty list within a 'data' key for consistency.
-                 return {"data": []}
-
-            # SEMrush often returns single row for phrase_this, list for others
-            # Return the first item if it was likely a single-row response, else the list
-            if endpoint_type == "phrase_this" and len(parsed_data) == 1:
-                return parsed_data[0]
-            else:
-                return {"data": parsed_data} # Wrap list results in a 'data' key
-
-        except requests.exceptions.Timeout:
+        try:
+            if self._client is not None:
+                response = await self._client.get(url, params=merged)
+                response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("SEMrush API request successful (Status: %s). Response text length: %d",
+                                 response.status_code, len(response.text))
+                # Parse off the event loop: a large display_limit response
+                # would otherwise stall concurrent product fetches.
+                return await asyncio.to_thread(
+                    self._parse_response_lines, iter(response.text.splitlines()), endpoint_type, merged)
+            # Blocking call runs on a worker thread so concurrent
+            # coroutines aren't stalled behind the round-trip.
+            return await asyncio.to_thread(self._fetch_streaming, url, merged, endpoint_type)
+
+        except _TIMEOUT_ERRORS:
             logger.error(f"SEMrush API request timed out for endpoint {endpoint_type}.")
             return {"error": "SEMrush API request timed out"}
-        except requests.exceptions.HTTPError as e:
+        except _HTTP_STATUS_ERRORS as e:
             logger.error(f"SEMrush API request failed with HTTP status {e.response.status_code}. Response: {e.response.text}")
-            return {"error": f"SEMrush API HTTP error: {e.response.status_code} - {e.response.reason}"}
-        except requests.exceptions.RequestException as e:
+            reason = getattr(e.response, 'reason', None) or getattr(e.response, 'reason_phrase', '')
+            return {"error": f"SEMrush API HTTP error: {e.response.status_code} - {reason}"}
+        except _REQUEST_ERRORS as e:
             logger.exception(f"SEMrush API request failed: {e}")
             return {"error": f"SEMrush API request failed: {e}"}
         except Exception as e:
@@ -126,6 +516,12 @@ class SEMrushTool(BaseTool):
              logger.error("SEMrush API key not configured, cannot invoke tool.")
              return {"error": "SEMrush API key not configured"}
 
+        cache_key = (keyword.lower().strip(), database)
+        cached = self._result_cache_get(cache_key)
+        if cached is not None:
+            logger.debug("SEMrush result cache hit for %s", cache_key)
+            return cached
+
         # --- Get Keyword Overview data ---
         overview_params = {
             "type": "phrase_this",
@@ -133,14 +529,6 @@ class SEMrushTool(BaseTool):
             "database": database,
             "export_columns": "Ph,Nq,Cp,Co,Nr,Td" # Keyword, Volume, CPC, Competition, Results, Trend
         }
-        logger.info(f"Fetching SEMrush keyword overview for '{keyword}' in db '{database}'")
-        overview_data = self._make_api_request("phrase_this", overview_params)
-
-        if "error" in overview_data:
-            logger.error(f"Failed to get keyword overview: {overview_data['error']}")
-            # Return only the error, or continue to try related? For now, return error.
-            return {"error": f"Failed to get SEMrush keyword overview: {overview_data['error']}"}
-
         # --- Get Related Keywords ---
         related_params = {
             "type": "phrase_related",
@@ -149,8 +537,23 @@ class SEMrushTool(BaseTool):
             "export_columns": "Ph,Nq,Rl", # Keyword, Volume, Relevance
             "display_limit": 10 # Get top 10 related
         }
-        logger.info(f"Fetching SEMrush related keywords for '{keyword}' in db '{database}'")
-        related_data_result = self._make_api_request("phrase_related", related_params)
+
+        # The two requests are independent: overlap their round-trips so
+        # wall-clock cost is max(overview, related) instead of the sum.
+        # With batching enabled the overview rides a coalesced phrase_these
+        # call shared with concurrent invocations.
+        logger.info(f"Fetching SEMrush keyword overview and related keywords for '{keyword}' in db '{database}'")
+        overview_coro = (self._batcher.fetch(keyword, database) if self._batcher is not None
+                         else self._make_api_request("phrase_this", overview_params))
+        overview_data, related_data_result = await asyncio.gather(
+            overview_coro,
+            self._make_api_request("phrase_related", related_params),
+        )
+
+        if "error" in overview_data:
+            logger.error(f"Failed to get keyword overview: {overview_data['error']}")
+            # Return only the error, or continue to try related? For now, return error.
+            return {"error": f"Failed to get SEMrush keyword overview: {overview_data['error']}"}
 
         related_keywords_processed = []
         related_error = None
@@ -158,16 +561,8 @@ class SEMrushTool(BaseTool):
             related_error = f"Failed to get SEMrush related keywords: {related_data_result['error']}"
             logger.warning(related_error)
         elif "data" in related_data_result and isinstance(related_data_result["data"], list):
-            # Process the list of related keywords
-            for item in related_data_result["data"]:
-                 try:
-                     related_keywords_processed.append({
-                         "keyword": item.get("keyword"),
-                         "search_volume": int(item.get("search_volume", 0)),
-                         "relevance": float(item.get("relevance", 0.0))
-                     })
-                 except (ValueError, TypeError, KeyError) as e:
-                     logger.warning(f"Could not process related keyword item {item}: {e}")
+            # Rows are already typed by the phrase_related schema parser.
+            related_keywords_processed = related_data_result["data"]
             logger.info(f"Successfully processed {len(related_keywords_processed)} related keywords.")
         else:
             related_error = "Unexpected format received for related keywords."
@@ -175,28 +570,65 @@ class SEMrushTool(BaseTool):
 
 
         # --- Combine results ---
-        final_result = {}
-        try:
-            # Safely extract and convert overview data
-            final_result["keyword"] = overview_data.get("keyword") # Already normalized header
-            final_result["search_volume"] = int(overview_data.get("search_volume", 0))
-            # SEMrush CPC might have currency symbols or commas, attempt clean conversion
-            cpc_str = overview_data.get("cpc_(usd)", "0.0").replace('$', '').replace(',', '')
-            final_result["cpc"] = float(cpc_str) if cpc_str else 0.0
-            final_result["competition"] = float(overview_data.get("competition", 0.0))
-            final_result["number_of_results"] = int(overview_data.get("number_of_results", 0))
-            trend_str = overview_data.get("trend", "")
-            final_result["trend"] = [int(t) for t in trend_str.split(',')] if trend_str else []
-
-            # Add related keywords and any error message
-            final_result["related_keywords"] = related_keywords_processed
-            if related_error:
-                final_result["related_keywords_error"] = related_error
-
-            logger.info(f"SEMrushTool invocation finished successfully for keyword '{keyword}'.")
-
-        except (ValueError, TypeError, KeyError) as e:
-             logger.exception(f"Error processing combined SEMrush data for keyword '{keyword}': {e}")
-             return {"error": f"Error processing SEMrush API response data: {e}", "raw_overview": overview_data, "raw_related": related_data_result}
+        # Overview fields are already typed by the phrase_this schema parser.
+        final_result = {
+            "keyword": overview_data.get("keyword"),
+            "search_volume": overview_data.get("search_volume", 0),
+            "cpc": overview_data.get("cpc", 0.0),
+            "competition": overview_data.get("competition", 0.0),
+            "number_of_results": overview_data.get("number_of_results", 0),
+            "trend": overview_data.get("trend", []),
+            "related_keywords": related_keywords_processed,
+        }
+        if related_error:
+            final_result["related_keywords_error"] = related_error
+
+        logger.info(f"SEMrushTool invocation finished successfully for keyword '{keyword}'.")
 
+        self._result_cache_put(cache_key, final_result)
         return final_result
+
+    def _error_cache_get(self, key):
+        """Return a cached error response for key if still fresh, else None."""
+        entry = self._error_cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._error_cache.pop(key, None)
+            return None
+        return value
+
+    def _error_cache_put(self, key, result):
+        """Cache an inline API error, TTL chosen by error class.
+
+        Only errors reported by SEMrush itself are cached; transport
+        failures (timeouts, connection errors) are transient and should be
+        retried immediately."""
+        error_text = result.get("error", "")
+        if "SEMrush API error" not in error_text:
+            return
+        upper = error_text.upper()
+        ttl = (_QUOTA_ERROR_TTL_SECONDS if "UNITS" in upper or "LIMIT" in upper
+               else _ERROR_CACHE_TTL_SECONDS)
+        if len(self._error_cache) >= _ERROR_CACHE_MAX_ENTRIES:
+            self._error_cache.pop(next(iter(self._error_cache)), None)
+        self._error_cache[key] = (result, time.monotonic() + ttl)
+
+    def _result_cache_get(self, key):
+        """Return the cached invoke result for key if still fresh, else None."""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        if time.monotonic() - fetched_at >= _RESULT_CACHE_TTL_SECONDS:
+            self._result_cache.pop(key, None)
+            return None
+        return value
+
+    def _result_cache_put(self, key, value):
+        if len(self._result_cache) >= _RESULT_CACHE_MAX_ENTRIES:
+            # Evict the oldest insertion (dicts preserve insert order);
+            # enough to bound memory for long-lived processes.
+            self._result_cache.pop(next(iter(self._result_cache)), None)
+        self._result_cache[key] = (value, time.monotonic())
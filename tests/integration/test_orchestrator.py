@@ -1,7 +1,23 @@
+import argparse
 import asyncio
 import json
 import os
 import logging
+import time
+
+# Optional: C-implemented serializer, much faster than stdlib json once the
+# context carries large related-keyword lists, and handles numpy arrays.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_indented(obj) -> str:
+    """Pretty-print obj as JSON, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, indent=2, default=str)
 
 # Configure logging for testing
 logging.basicConfig(
@@ -24,25 +40,44 @@ except ImportError as e:
           "or that the seo_agent_hub package is installed correctly.")
     sys.exit(1)
 
-async def main():
+def _build_products(n: int) -> list:
+    """Build n distinct sample products by varying the EAN and title."""
+    products = []
+    for i in range(n):
+        ean = f"{1234567890123 + i:013d}"
+        products.append({
+            "ean": ean,
+            "title": f"Example Cloud Accounting Software {i}",
+            "brand": "ExampleSoft",
+            "category": "Software > Business > Accounting",
+            "product_url": f"https://example.com/products/cloud-accounting-{i}",
+            "merchant_center_id": f"online:en:DK:{ean}"
+            # Add any other relevant initial product fields
+        })
+    return products
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted list."""
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1)
+    return sorted_values[max(index, 0)]
+
+
+async def main(n: int = 1, concurrency: int = 5):
     """
-    Initializes and runs the SEOOrchestrator for a sample product.
+    Initializes the SEOOrchestrator and fans n sample products through it.
+
+    With n=1 this behaves like the original single-product driver; larger
+    n exercises the pooled-connection/cache paths under the concurrency
+    the tools were built for and reports p50/p95 per-product latency.
     """
     logger = logging.getLogger(__name__)
     logger.info("Starting orchestrator test...")
 
     # --- Sample Product Data ---
     # Replace with realistic data for testing
-    sample_product_data = {
-        "ean": "1234567890123", # Example EAN
-        "title": "Example Cloud Accounting Software",
-        "brand": "ExampleSoft",
-        "category": "Software > Business > Accounting",
-        "product_url": "https://example.com/products/cloud-accounting", # Example URL
-        "merchant_center_id": "online:en:DK:1234567890123" # Example MC ID format
-        # Add any other relevant initial product fields
-    }
-    logger.info(f"Using sample product data: {sample_product_data}")
+    products = _build_products(n)
+    logger.info(f"Using {len(products)} sample product(s); first: {products[0]}")
 
     # --- Initialize Orchestrator ---
     # Assumes necessary environment variables (API keys, IDs) are set
@@ -59,21 +94,39 @@ async def main():
         return
 
     # --- Run Orchestrator ---
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+
+    async def run_one(product_data):
+        async with semaphore:
+            logger.info(f"Calling orchestrator.process_product for EAN: {product_data.get('ean')}...")
+            started = time.perf_counter()
+            final_context = await orchestrator.process_product(product_data)
+            durations.append(time.perf_counter() - started)
+            logger.info("Orchestrator process_product finished.")
+            return final_context
+
     try:
-        logger.info(f"Calling orchestrator.process_product for EAN: {sample_product_data.get('ean')}...")
-        final_context = await orchestrator.process_product(sample_product_data)
-        logger.info("Orchestrator process_product finished.")
+        results = await asyncio.gather(*(run_one(p) for p in products))
 
         # --- Print Results ---
         print("\n" + "="*20 + " Final Context " + "="*20)
-        print(json.dumps(final_context, indent=2))
+        print(_dumps_indented(results[0] if n == 1 else results))
         print("="*55)
 
+        # --- Timing Summary ---
+        timings = sorted(durations)
+        logger.info(
+            "Processed %d product(s) at concurrency %d: p50=%.3fs p95=%.3fs max=%.3fs",
+            len(timings), concurrency,
+            _percentile(timings, 50), _percentile(timings, 95), timings[-1],
+        )
+
         # --- Optional: Inspect Shared Memory ---
         # You might want to inspect the final state of shared memory for debugging
         # final_memory = orchestrator.memory.get_all()
         # print("\n" + "="*20 + " Final Shared Memory " + "="*20)
-        # print(json.dumps(final_memory, indent=2, default=str)) # Use default=str for non-serializable items
+        # print(_dumps_indented(final_memory)) # default=str fallback covers non-serializable items
         # print("="*61)
 
 
@@ -85,4 +138,9 @@ if __name__ == "__main__":
     # from dotenv import load_dotenv
     # load_dotenv() # Uncomment if you use a .env file in the root
 
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Run the orchestrator over sample products.")
+    parser.add_argument("--n", type=int, default=1, help="number of sample products to process")
+    parser.add_argument("--concurrency", type=int, default=5, help="max products in flight at once")
+    cli_args = parser.parse_args()
+
+    asyncio.run(main(n=cli_args.n, concurrency=cli_args.concurrency))